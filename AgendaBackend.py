@@ -0,0 +1,141 @@
+"""
+Document backends the agenda generators write through.
+
+The generators only use the subset of the UNO API they need (text, tables, cursors, search/replace, graphic objects)
+on the objects returned by the backend, and create UNO structs and enums through it, so the same code can run on a
+live LibreOffice (UnoBackend) or on an in-memory document (MemoryBackend).
+"""
+from abc import ABC, abstractmethod
+
+
+class DocumentBackend(ABC):
+    """
+    Interface of the document backends: what the generators use, and what the callers use to prepare the document
+    and export it.
+    """
+
+    @abstractmethod
+    def get_context(self):
+        """
+        Returns:
+            tuple: (ctx, desktop, smgr, model)
+                ctx: The UNO component context.
+                desktop: The central desktop object.
+                smgr: The UNO service manager.
+                model: The Writer document model the generators write into.
+        """
+
+    @abstractmethod
+    def new_document(self):
+        """
+        Creates a new Writer document and makes the generators write into it.
+
+        Returns:
+            The Writer document model.
+        """
+
+    @abstractmethod
+    def export_document(self, path: str, filter_name: str = "writer8") -> None:
+        """
+        Stores the Writer document the generators write into at the given path.
+
+        Args:
+            path (str): Full path of the output file.
+            filter_name (str, optional): LibreOffice export filter (e.g., 'writer8' or 'writer_pdf_Export').
+        """
+
+    @abstractmethod
+    def load_template(self, template_path: str):
+        """
+        Args:
+            template_path (str): Full path to the daily template file.
+
+        Returns:
+            The template document model.
+        """
+
+    @abstractmethod
+    def preload_template(self, template_path: str) -> None:
+        """
+        Loads a template ahead of the generators, and keeps it for the next load_template calls with that path.
+
+        Args:
+            template_path (str): Full path to the daily template file.
+        """
+
+    @abstractmethod
+    def close_template(self, template_doc) -> None:
+        """
+        Releases a template returned by load_template once the generator is done with it.
+
+        Args:
+            template_doc: The template document model.
+        """
+
+    @abstractmethod
+    def create_struct(self, type_name: str):
+        """
+        Args:
+            type_name (str): Full UNO type name of the struct (e.g., 'com.sun.star.table.BorderLine2').
+
+        Returns:
+            A new struct of the given type.
+        """
+
+    @abstractmethod
+    def enum(self, type_name: str, value: str):
+        """
+        Args:
+            type_name (str): Full UNO type name of the enum (e.g., 'com.sun.star.style.BreakType').
+            value (str): Name of the enum value (e.g., 'PAGE_AFTER').
+
+        Returns:
+            The enum value.
+        """
+
+    @abstractmethod
+    def invoke(self, obj, method_name: str, args: tuple):
+        """
+        Calls a method of a UNO object with the given arguments, without converting their types.
+
+        Args:
+            obj: The UNO object.
+            method_name (str): Name of the method.
+            args (tuple): Arguments of the call.
+
+        Returns:
+            The result of the call.
+        """
+
+
+_backend = None  # Backend used by the generators
+
+
+def get_backend(script_context=None) -> DocumentBackend:
+    """
+    Returns the backend used by the generators. If none was set with set_backend, a live LibreOffice backend is
+    created the first time.
+
+    Args:
+        script_context (optional): XSCRIPTCONTEXT when running as a macro inside LibreOffice.
+
+    Returns:
+        DocumentBackend: The current backend.
+    """
+    global _backend
+    if _backend is None:
+        # PyUNO is only needed (and imported) when the live backend is used
+        from UnoBackend import UnoBackend
+        _backend = UnoBackend(script_context=script_context)
+    return _backend
+
+
+def set_backend(backend: DocumentBackend) -> None:
+    """
+    Makes the generators write through the given backend.
+
+    Args:
+        backend (DocumentBackend): The backend, or None to go back to the default live LibreOffice backend.
+    """
+    global _backend
+    _backend = backend
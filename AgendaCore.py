@@ -0,0 +1,398 @@
+"""
+Configuration of the agenda and the computations that do not need LibreOffice: dates, table layouts and template
+analysis.
+
+This module imports no UNO, so it can be used from any Python and loads in a few milliseconds. The generators in
+AgendaGenerator render these layouts into a document.
+"""
+import calendar
+import collections
+import datetime
+import os
+import zipfile
+from xml.etree import ElementTree
+
+
+# UNO constants and enums used by the generators. Constant groups are plain numbers in PyUNO, enums are created
+# through the backend from their (type, value) names, so no PyUNO is needed to configure the agenda.
+class FontWeight:  # com.sun.star.awt.FontWeight
+    NORMAL = 100.0
+    BOLD = 150.0
+
+
+class ControlCharacter:  # com.sun.star.text.ControlCharacter
+    PARAGRAPH_BREAK = 0
+
+
+POSSIZE = 15  # com.sun.star.awt.PosSize.POSSIZE
+SOLID = 0  # com.sun.star.table.BorderLineStyle.SOLID
+VER_CENTER = 2  # com.sun.star.text.VertOrientation.CENTER
+HOR_CENTER = ('com.sun.star.style.ParagraphAdjust', 'CENTER')
+PAGE_AFTER = ('com.sun.star.style.BreakType', 'PAGE_AFTER')
+PAGE_BEFORE = ('com.sun.star.style.BreakType', 'PAGE_BEFORE')
+
+# variables for page configuration (reMarkable)
+# Margins for the page ('top', 'bottom', 'left', 'right').
+PAGE_MARGINS = {'top': 400, 'bottom': 400, 'left': 1300, 'right': 400}
+PAGE_SIZE = {'width': 15770, 'height': 21030}  # Page size ('width', 'height').
+# Named page profiles ('margins', 'size') that can be chosen when generating the whole agenda.
+PAGE_PROFILES = {
+    'rmk': {'margins': PAGE_MARGINS, 'size': PAGE_SIZE},
+    'a4': {'margins': {'top': 1000, 'bottom': 1000, 'left': 2000, 'right': 1000},
+           'size': {'width': 21000, 'height': 29700}},
+    'a5': {'margins': {'top': 700, 'bottom': 700, 'left': 1500, 'right': 700},
+           'size': {'width': 14800, 'height': 21000}},
+}
+LINK_COLOR = "6776679"  # Hyperlink color
+LINK_UNDERLINE = False  # Whether hyperlinks are underlined.
+
+# variables for default text style and border styles for month headers in the monthly agenda
+MONTH_HEADER_CHAR_HEIGHT = 12  # Font size for month headers
+MONTH_HEADER_FONT_NAME = 'Open Sans'  # Font name for month headers
+MONTH_HEADER_FONT_WEIGHT = FontWeight.NORMAL  # Font weight for month headers
+MONTH_HEADER_COLOR = "6776679"  # Font color for month headers
+MONTH_HEADER_ALIGN = HOR_CENTER  # Paragraph alignment for month headers
+
+# Border style variables
+MONTH_TABLE_BORDER_COLOR = "6776679"  # Border color for month tables
+MONTH_TABLE_BOTTOM_INNER_WIDTH = 10  # Inner line width for bottom border
+MONTH_TABLE_BOTTOM_LINE_DISTANCE = 0  # Line distance for bottom border
+MONTH_TABLE_BOTTOM_LINE_WIDTH = 5  # Line width for bottom border
+MONTH_TABLE_BOTTOM_OUTER_WIDTH = 0  # Outer line width for bottom border
+MONTH_TABLE_LINE_STYLE = SOLID  # Line style for borders
+
+# Yearly calendar table: weeks in a month (6) * number of months/3 (4) + 3 separators for each month row (12) rows,
+# days of week (7) * number of months in row (3) + 2 separators columns
+CALENDAR_ROWS_COUNT = 36
+CALENDAR_COLUMNS_COUNT = 23
+
+# Names the daily template must use
+TEMPLATE_DAY_TABLE = "DayTable"  # Table copied for each day
+TEMPLATE_CALENDAR_TABLE = "CalendarTable"  # Optional table filled with the calendar of the month
+TEMPLATE_CALENDAR_ICON = "CalendarIcon"  # Image linked to the yearly calendar
+TEMPLATE_PLACEHOLDERS = ("<d", "<MONTH>", "<WEEKDAY>", "<WEEKNUMBER>")
+DEFAULT_TEMPLATE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'template_rmk.odt')  # Included template
+
+# Output formats: (LibreOffice export filter, content type)
+OUTPUT_FORMATS = {
+    'odt': ('writer8', 'application/vnd.oasis.opendocument.text'),
+    'pdf': ('writer_pdf_Export', 'application/pdf'),
+}
+
+# Layout of the yearly calendar: month names to merge in each month row and (column, row, text, link) of the cells
+CalendarLayout = collections.namedtuple('CalendarLayout', 'month_rows cells')
+# What analyze_template found in a daily template
+TemplateInfo = collections.namedtuple('TemplateInfo', 'tables images placeholders month_abbreviations')
+# Result of check_template: problems that make the template unusable, and parts the generator would just skip
+TemplateCheck = collections.namedtuple('TemplateCheck', 'errors warnings')
+# Table of a daily template as read by read_template_tables, and its cells (rows of TemplateCell)
+TemplateTable = collections.namedtuple('TemplateTable', 'name rows')
+# Cell of a template table: its paragraphs joined by new lines, the tables nested in it and the images in it
+TemplateCell = collections.namedtuple('TemplateCell', 'text tables images')
+
+_TABLE_NS = "urn:oasis:names:tc:opendocument:xmlns:table:1.0"
+_TEXT_NS = "urn:oasis:names:tc:opendocument:xmlns:text:1.0"
+_DRAW_NS = "urn:oasis:names:tc:opendocument:xmlns:drawing:1.0"
+
+
+def daterange(start_date: datetime.date, end_date: datetime.date):
+    """
+    Generator that yields each date from start_date up to, but not including, end_date.
+
+    Args:
+        start_date (datetime.date or datetime.datetime): The start date (inclusive).
+        end_date (datetime.date or datetime.datetime): The end date (not included).
+
+    Yields:
+        datetime.date or datetime.datetime: Each date in the range.
+    """
+    days = int((end_date - start_date).days)
+    for n in range(days):
+        yield start_date + datetime.timedelta(n)
+
+
+def day_link(day: datetime.date) -> str:
+    """
+    Returns the hyperlink URL to the daily page of the given date.
+    """
+    return f'#{TEMPLATE_DAY_TABLE}{day.timetuple().tm_yday}|table'
+
+
+def month_link(month_num: int) -> str:
+    """
+    Returns the hyperlink URL to the monthly agenda table of the given month.
+    """
+    return f'#MontlyAgenda{calendar.month_name[month_num]}Table|table'
+
+
+def daily_date_range(year: int, months: tuple[int, int] = None, test: bool = False):
+    """
+    Returns the range of dates with a daily page.
+
+    Args:
+        year (int): The year of the agenda.
+        months (tuple[int, int], optional): Starting and ending month. If None, the whole year.
+        test (bool, optional): If True, only a few days for testing.
+
+    Returns:
+        tuple: (first_day, last_day), last_day not included.
+    """
+    if test:
+        first_day = datetime.datetime(year, 8, 31)
+        last_day = datetime.datetime(year, 9, 3)
+    elif months:
+        first_day = datetime.datetime(year, months[0], 1)
+        last_day = datetime.datetime(year + months[1] // 12, months[1] % 12 + 1, 1)
+    else:
+        first_day = datetime.datetime(year, 1, 1)
+        last_day = datetime.datetime(year + 1, 1, 1)
+    return first_day, last_day
+
+
+def month_calendars(year: int) -> list:
+    """
+    Returns the 7x7 calendar of each month for the daily pages: the weekday header and up to six weeks, with ''
+    for the days that do not belong to the month.
+
+    Args:
+        year (int): The year of the agenda.
+
+    Returns:
+        list: The calendars, indexed by month number (index 0 is None).
+    """
+    calendars = [None] * 13
+    for month_num in range(1, 13):
+        month_calendar = list(calendar.monthcalendar(year, month_num))
+        month_calendar.insert(0, calendar.weekheader(1).split(" "))
+        month_calendar = [list(map(lambda x: x if x != 0 else '', i)) for i in month_calendar]
+        while len(month_calendar) < 7:
+            month_calendar.append([''] * 7)
+        calendars[month_num] = month_calendar
+    return calendars
+
+
+def month_days(year: int, month_num: int) -> list[tuple[int, str, str]]:
+    """
+    Returns the rows of the monthly agenda table of the given month.
+
+    Args:
+        year (int): The year of the agenda.
+        month_num (int): The month (1-12).
+
+    Returns:
+        list[tuple[int, str, str]]: (day, weekday initial, link to the daily page) of each day of the month.
+    """
+    week_day_header = calendar.weekheader(1).split(" ")
+    _, days_count = calendar.monthrange(year, month_num)
+    days = []
+    for day in range(1, days_count + 1):
+        date = datetime.date(year, month_num, day)
+        days.append((day, week_day_header[date.weekday()], day_link(date)))
+    return days
+
+
+def yearly_calendar_layout(year: int) -> CalendarLayout:
+    """
+    Computes the content of the yearly calendar table: four rows of three months, each one with a row for the month
+    names, a row for the weekday headers, six rows of weeks and a separator row.
+
+    Args:
+        year (int): The year of the calendar.
+
+    Returns:
+        CalendarLayout: (month_rows, cells)
+            month_rows: (row, month names) of the rows whose three months are merged cells.
+            cells: (column, row, text, link or None) of the weekday headers and the days.
+    """
+    # Table configuration
+    col_month = [0] * 7 + [None] + [1] * 7 + [None] + [2] * 7
+    row_month = (
+        [None, None] + [0] * 6 + [None] +
+        [None, None] + [1] * 6 + [None] +
+        [None, None] + [2] * 6 + [None] +
+        [None, None] + [3] * 6 + [None]
+    )
+    week_day_header = calendar.weekheader(1).split(" ")
+    month_names = calendar.month_name[1:]
+    month_calendar_lists = [None] + [calendar.monthcalendar(year, month) for month in range(1, 13)]
+
+    month_rows = []
+    cells = []
+    for row_i in range(CALENDAR_ROWS_COUNT):
+        row_type_index = row_i % 9
+        month_row_idx = row_month[row_i]  # Index of the month in this row
+
+        if row_type_index == 0:  # Month name row
+            month_rows.append((row_i, month_names[3 * (row_i // 9):3 * (row_i // 9) + 3]))
+            continue
+
+        for col_i in range(CALENDAR_COLUMNS_COUNT):
+            day_of_week_idx = col_i % 8
+            month_col_idx = col_month[col_i]  # Index of the month in this column
+
+            if month_col_idx is None:
+                continue  # Separator column
+
+            if month_row_idx is not None:
+                # Day cell: day number and hyperlink
+                month = 3 * month_row_idx + month_col_idx + 1
+                week_number = row_type_index - 2
+                month_calendar_list = month_calendar_lists[month]
+                if week_number < len(month_calendar_list):
+                    day = month_calendar_list[week_number][day_of_week_idx]
+                    if day != 0:  # do not add days that do not belong to the month
+                        cells.append((col_i, row_i, f"{day}", day_link(datetime.date(year, month, day))))
+            elif row_type_index == 1:
+                # Weekday header row (M, T, W, T, F, S, S)
+                cells.append((col_i, row_i, week_day_header[day_of_week_idx], None))
+
+    return CalendarLayout(month_rows, cells)
+
+
+def _paragraph_text(element) -> str:
+    """
+    Returns the text of an ODF paragraph, with its spans joined and the spacing elements as spaces.
+    """
+    parts = [element.text or '']
+    for child in element:
+        if child.tag in (f'{{{_TEXT_NS}}}s', f'{{{_TEXT_NS}}}tab', f'{{{_TEXT_NS}}}line-break'):
+            parts.append(' ' * int(child.get(f'{{{_TEXT_NS}}}c', 1)))
+        else:
+            parts.append(_paragraph_text(child))
+        parts.append(child.tail or '')
+    return ''.join(parts)
+
+
+def analyze_template(template_path: str) -> TemplateInfo:
+    """
+    Reads a daily template (.odt) without LibreOffice.
+
+    Args:
+        template_path (str): Full path to the daily template file.
+
+    Returns:
+        TemplateInfo: (tables, images, placeholders, month_abbreviations)
+            tables: Names of all the tables of the template.
+            images: Names of the images in the day table.
+            placeholders: Placeholders found in the day table.
+            month_abbreviations: Month abbreviations (JAN, FEB, ...) found in the day table.
+    """
+    with zipfile.ZipFile(template_path) as odt:
+        root = ElementTree.fromstring(odt.read('content.xml'))
+
+    table_name = f'{{{_TABLE_NS}}}name'
+    tables = [table.get(table_name) for table in root.iter(f'{{{_TABLE_NS}}}table')]
+    day_table = next((table for table in root.iter(f'{{{_TABLE_NS}}}table')
+                      if table.get(table_name) == TEMPLATE_DAY_TABLE), None)
+    if day_table is None:
+        return TemplateInfo(tables, [], [], [])
+
+    images = [frame.get(f'{{{_DRAW_NS}}}name') for frame in day_table.iter(f'{{{_DRAW_NS}}}frame')
+              if frame.find(f'{{{_DRAW_NS}}}image') is not None]
+
+    # LibreOffice searches are case insensitive and do not go across paragraphs
+    paragraphs = [_paragraph_text(p).lower() for p in day_table.iter()
+                  if p.tag in (f'{{{_TEXT_NS}}}p', f'{{{_TEXT_NS}}}h')]
+    placeholders = [placeholder for placeholder in TEMPLATE_PLACEHOLDERS
+                    if any(placeholder.lower() in text for text in paragraphs)]
+    month_abbreviations = [calendar.month_abbr[month_num].upper() for month_num in range(1, 13)
+                           if any(calendar.month_abbr[month_num].lower() in text for text in paragraphs)]
+    return TemplateInfo(tables, images, placeholders, month_abbreviations)
+
+
+def _table_rows(element) -> list:
+    # rows can be grouped (header rows, row groups), and nested tables have their own rows
+    rows = []
+    for child in element:
+        if child.tag == f'{{{_TABLE_NS}}}table-row':
+            rows.append(child)
+        elif child.tag in (f'{{{_TABLE_NS}}}table-header-rows', f'{{{_TABLE_NS}}}table-rows',
+                           f'{{{_TABLE_NS}}}table-row-group'):
+            rows += _table_rows(child)
+    return rows
+
+
+def _read_table(table) -> TemplateTable:
+    rows = []
+    for row in _table_rows(table):
+        cells = []
+        # the cells covered by merged cells are not cells in Writer
+        for cell in row.findall(f'{{{_TABLE_NS}}}table-cell'):
+            cells += [_read_cell(cell)] * int(cell.get(f'{{{_TABLE_NS}}}number-columns-repeated', 1))
+        rows += [cells] * int(row.get(f'{{{_TABLE_NS}}}number-rows-repeated', 1))
+    return TemplateTable(table.get(f'{{{_TABLE_NS}}}name'), rows)
+
+
+def _read_cell(cell) -> TemplateCell:
+    paragraphs, tables, images = [], [], []
+    for child in cell:
+        if child.tag == f'{{{_TABLE_NS}}}table':
+            tables.append(_read_table(child))
+            continue
+        for element in child.iter():
+            if element.tag in (f'{{{_TEXT_NS}}}p', f'{{{_TEXT_NS}}}h'):
+                paragraphs.append(_paragraph_text(element))
+            elif element.tag == f'{{{_DRAW_NS}}}frame' and element.find(f'{{{_DRAW_NS}}}image') is not None:
+                images.append(element.get(f'{{{_DRAW_NS}}}name'))
+    return TemplateCell('\n'.join(paragraphs), tables, images)
+
+
+def _top_level_tables(element):
+    for child in element:
+        if child.tag == f'{{{_TABLE_NS}}}table':
+            yield child
+        else:
+            yield from _top_level_tables(child)
+
+
+def read_template_tables(template_path: str) -> list[TemplateTable]:
+    """
+    Reads the structure of the tables of a daily template (.odt) without LibreOffice, e.g. to build it in memory.
+
+    Args:
+        template_path (str): Full path to the daily template file.
+
+    Returns:
+        list[TemplateTable]: The top level tables of the template, in document order. Their rows only have the cells
+            Writer has, i.e. not the ones covered by merged cells.
+    """
+    with zipfile.ZipFile(template_path) as odt:
+        root = ElementTree.fromstring(odt.read('content.xml'))
+    return [_read_table(table) for table in _top_level_tables(root)]
+
+
+def check_template(template_path: str) -> TemplateCheck:
+    """
+    Checks that a daily template has everything the daily agenda needs.
+
+    Args:
+        template_path (str): Full path to the daily template file.
+
+    Returns:
+        TemplateCheck: (errors, warnings)
+            errors: Problems the generator cannot render with (unreadable file, no day table or calendar icon).
+            warnings: Placeholders and month abbreviations missing from the day table; they are just not filled
+                in or linked.
+    """
+    try:
+        info = analyze_template(template_path)
+    except OSError as e:
+        return TemplateCheck([f"Cannot read the template: {e}"], [])
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError):
+        return TemplateCheck(["The template is not an OpenDocument text (.odt) file"], [])
+
+    if TEMPLATE_DAY_TABLE not in info.tables:
+        return TemplateCheck([f"There is no table named '{TEMPLATE_DAY_TABLE}'"], [])
+
+    errors = []
+    if TEMPLATE_CALENDAR_ICON not in info.images:
+        errors.append(f"There is no image named '{TEMPLATE_CALENDAR_ICON}' in '{TEMPLATE_DAY_TABLE}'")
+    warnings = []
+    for placeholder in TEMPLATE_PLACEHOLDERS:
+        if placeholder not in info.placeholders:
+            warnings.append(f"The placeholder '{placeholder}' is missing from '{TEMPLATE_DAY_TABLE}'")
+    for month_num in range(1, 13):
+        if calendar.month_abbr[month_num].upper() not in info.month_abbreviations:
+            warnings.append(f"The month '{calendar.month_abbr[month_num].upper()}' is missing from "
+                            f"'{TEMPLATE_DAY_TABLE}'")
+    return TemplateCheck(errors, warnings)
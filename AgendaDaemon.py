@@ -0,0 +1,492 @@
+"""
+Long-lived render daemon for the agenda generator.
+
+Keeps a pool of warm headless LibreOffice instances, each one with its UNO bridge connected and the daily templates
+preloaded, and serves agenda builds over localhost HTTP:
+
+    POST /render   {"year": 2025, "months": [1, 3], "template": "/path/to/template_rmk.odt", "profile": "rmk",
+                    "format": "pdf"}
+    GET  /status
+
+Jobs wait in a bounded queue until one of the office instances is free. It must be run with the Python shipped
+with LibreOffice, e.g.:
+
+    "D:\\Program Files\\LibreOffice\\program\\python.exe" AgendaDaemon.py --workers 2 --template template_rmk.odt
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import pathlib
+import queue
+import shutil
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from AgendaCore import OUTPUT_FORMATS, PAGE_PROFILES, check_template
+
+
+# variables for the daemon configuration
+DAEMON_HOST = '127.0.0.1'  # Only local clients can reach the daemon
+DAEMON_PORT = 8765  # Port of the HTTP server
+SOFFICE_PATH = 'soffice'  # LibreOffice executable used to start the office instances
+OFFICE_FIRST_PORT = 2100  # Office instance i listens on OFFICE_FIRST_PORT + i
+OFFICE_START_TIMEOUT = 60  # Seconds to wait for a new office instance to accept connections
+WORKERS = 2  # Number of office instances, i.e. jobs rendered at the same time
+MAX_QUEUED_JOBS = 16  # Jobs waiting for a free office instance before new ones are rejected
+JOB_TIMEOUT = 1800  # Seconds a single job may take (a whole year of daily pages takes several minutes)
+
+
+def _start_office(soffice_path: str, port: int, profile_dir: str) -> subprocess.Popen:
+    """
+    Starts a headless LibreOffice instance listening on the given port. Each instance needs its own user profile,
+    otherwise the new process just hands over to the one already running.
+
+    Args:
+        soffice_path (str): LibreOffice executable.
+        port (int): Port where the instance accepts UNO connections.
+        profile_dir (str): Directory for the user profile of the instance.
+
+    The instance is started in its own process group, so that _kill_office also stops the processes it starts.
+
+    Returns:
+        subprocess.Popen: The office process.
+    """
+    if os.name == 'nt':
+        group = {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+    else:
+        group = {'start_new_session': True}
+    return subprocess.Popen([
+        soffice_path, '--headless', '--invisible', '--nologo', '--norestore', '--nodefault',
+        f'-env:UserInstallation={pathlib.Path(profile_dir).as_uri()}',
+        f'--accept=socket,host=localhost,port={port};urp;',
+    ], **group)
+
+
+def _kill_office(pid: int) -> None:
+    """
+    Kills an office instance started by _start_office, with the processes it started (e.g. soffice.bin), so that
+    its port is free again.
+
+    Args:
+        pid (int): Process id of the office instance.
+    """
+    if os.name == 'nt':
+        subprocess.run(['taskkill', '/F', '/T', '/PID', str(pid)], capture_output=True)
+        return
+    try:
+        os.killpg(pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+
+def _connect_office(backend):
+    """
+    Connects to a starting office instance, retrying until it accepts connections or OFFICE_START_TIMEOUT expires.
+
+    Args:
+        backend (UnoBackend): The backend of the worker.
+
+    Returns:
+        tuple: (ctx, desktop, smgr)
+    """
+    from com.sun.star.connection import NoConnectException
+
+    deadline = time.monotonic() + OFFICE_START_TIMEOUT
+    while True:
+        try:
+            return backend.connect()
+        except NoConnectException:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.5)
+
+
+def _start_warm_office(backend, soffice_path: str, port: int, profile_dir: str, templates: list[str], office_pid):
+    """
+    Starts an office instance, connects the backend to it and preloads the templates.
+
+    Args:
+        backend (UnoBackend): The backend of the worker.
+        soffice_path (str): LibreOffice executable.
+        port (int): Port where the instance accepts UNO connections.
+        profile_dir (str): Directory for the user profile of the instance.
+        templates (list[str]): Full paths of the templates to preload.
+        office_pid (multiprocessing.Value): Where the process id of the instance is published.
+
+    Returns:
+        tuple: (office, desktop)
+            office (subprocess.Popen): The office process.
+            desktop: The central desktop object of the instance.
+    """
+    office = _start_office(soffice_path, port, profile_dir)
+    office_pid.value = office.pid
+    try:
+        ctx, desktop, smgr = _connect_office(backend)
+        for template_path in templates:
+            backend.preload_template(template_path)
+    except BaseException:
+        # the caller never gets the process to stop it
+        _kill_office(office.pid)
+        office.wait()
+        office_pid.value = 0
+        raise
+    return office, desktop
+
+
+def _render_job(agenda, backend, job: dict) -> tuple[int, bytes]:
+    """
+    Renders one job into a new Writer document and returns the exported file.
+
+    Args:
+        agenda: The AgendaGenerator module.
+        backend (UnoBackend): The backend of the worker.
+        job (dict): The job, as returned by _parse_job.
+
+    Returns:
+        tuple[int, bytes]: HTTP status and response body (the file, or an error message).
+    """
+    model = backend.new_document()
+    fd, output_path = tempfile.mkstemp(suffix=f".{job['format']}")
+    os.close(fd)
+    try:
+        # Only the daemon's templates stay loaded, the others are loaded and closed by this job
+        agenda.generate_agenda(job['year'], job['template'], months=job['months'], profile=job['profile'])
+        backend.export_document(output_path, OUTPUT_FORMATS[job['format']][0])
+        with open(output_path, 'rb') as output_file:
+            return HTTPStatus.OK, output_file.read()
+    finally:
+        backend.document = None
+        model.close(True)
+        os.remove(output_path)
+
+
+def _office_worker(index: int, conn, soffice_path: str, templates: list[str], profile_dir: str, office_pid) -> None:
+    """
+    Main loop of a worker process. Starts its own office instance, preloads the templates and renders the jobs
+    received through the pipe until it receives None.
+
+    Args:
+        index (int): Index of the worker in the pool.
+        conn: End of the pipe shared with the daemon.
+        soffice_path (str): LibreOffice executable.
+        templates (list[str]): Full paths of the templates to preload.
+        profile_dir (str): Directory for the user profile of the office instance, created and removed by the daemon.
+        office_pid (multiprocessing.Value): Where the process id of the office instance is published, so the daemon
+            can kill it if the worker has to be killed.
+    """
+    # PyUNO is only imported in the worker processes, the daemon itself never talks to an office
+    import AgendaGenerator as agenda
+    from AgendaBackend import set_backend
+    from UnoBackend import UnoBackend
+
+    port = OFFICE_FIRST_PORT + index
+    backend = UnoBackend(f"uno:socket,host=localhost,port={port};urp;StarOffice.ComponentContext")
+    set_backend(backend)
+    office = None
+    desktop = None
+    try:
+        # Start the office before the first job arrives, so it finds it warm
+        office, desktop = _start_warm_office(backend, soffice_path, port, profile_dir, templates, office_pid)
+        while True:
+            job = conn.recv()
+            if job is None:
+                break
+
+            try:
+                # The office may have died while the worker was waiting for a job
+                if office.poll() is not None:
+                    _kill_office(office.pid)
+                    office, desktop = _start_warm_office(backend, soffice_path, port, profile_dir, templates,
+                                                         office_pid)
+                conn.send(_render_job(agenda, backend, job))
+            except Exception as e:
+                conn.send((HTTPStatus.INTERNAL_SERVER_ERROR, f"Rendering failed: {e}".encode()))
+    except EOFError:
+        # the daemon went away
+        pass
+    finally:
+        if office is not None:
+            try:
+                desktop.terminate()
+            except Exception:
+                pass
+            try:
+                office.wait(10)
+            except subprocess.TimeoutExpired:
+                _kill_office(office.pid)
+                office.wait()
+            # stopped, the daemon has nothing left to kill
+            office_pid.value = 0
+
+
+class _Worker:
+    """
+    Daemon side of a worker process, which owns one office instance.
+    """
+
+    def __init__(self, index: int, soffice_path: str, templates: list[str]):
+        self.index = index
+        self.soffice_path = soffice_path
+        self.templates = templates
+        self.start()
+
+    def start(self) -> None:
+        self.conn, child_conn = multiprocessing.Pipe()
+        self.profile_dir = tempfile.mkdtemp(prefix=f'agenda-office-{self.index}-')
+        self.office_pid = multiprocessing.Value('i', 0)
+        self.process = multiprocessing.Process(target=_office_worker, name=f'office-worker-{self.index}',
+                                               args=(self.index, child_conn, self.soffice_path, self.templates,
+                                                     self.profile_dir, self.office_pid))
+        self.process.start()
+        child_conn.close()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(15)
+        if self.process.is_alive():
+            self.kill()
+            return
+        # the worker may have died without stopping its office
+        if self.office_pid.value:
+            _kill_office(self.office_pid.value)
+        self.conn.close()
+        shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+    def kill(self) -> None:
+        """
+        Kills the worker process and its office instance, and removes the profile of the instance.
+        """
+        self.process.kill()
+        self.process.join()
+        # the office would keep its port, and the next instance on that port would never accept connections
+        if self.office_pid.value:
+            _kill_office(self.office_pid.value)
+        self.conn.close()
+        shutil.rmtree(self.profile_dir, ignore_errors=True)
+
+    def render(self, job: dict) -> tuple[int, bytes]:
+        """
+        Sends a job to the worker process and waits for the result. If the process dies or the job takes longer
+        than JOB_TIMEOUT, the worker is restarted.
+
+        Args:
+            job (dict): The job, as returned by _parse_job.
+
+        Returns:
+            tuple[int, bytes]: HTTP status and response body.
+        """
+        try:
+            self.conn.send(job)
+            if self.conn.poll(JOB_TIMEOUT):
+                return self.conn.recv()
+            status, message = HTTPStatus.GATEWAY_TIMEOUT, b"Rendering timed out"
+        except (EOFError, OSError):
+            status, message = HTTPStatus.INTERNAL_SERVER_ERROR, b"Office worker stopped unexpectedly"
+
+        self.kill()
+        self.start()
+        return status, message
+
+
+class RenderPool:
+    """
+    Pool of office workers. Jobs wait for a free worker, and are rejected once MAX_QUEUED_JOBS jobs are waiting.
+
+    Args:
+        workers (int): Number of office instances.
+        max_queued (int): Maximum number of jobs waiting for a free worker.
+        soffice_path (str): LibreOffice executable.
+        templates (list[str]): Full paths of the templates to preload in every instance.
+    """
+
+    def __init__(self, workers: int = WORKERS, max_queued: int = MAX_QUEUED_JOBS, soffice_path: str = SOFFICE_PATH,
+                 templates: list[str] = ()):
+        self.max_queued = max_queued
+        self.templates = list(templates)
+        self._workers = [_Worker(index, soffice_path, self.templates) for index in range(workers)]
+        self._idle = queue.Queue()
+        for worker in self._workers:
+            self._idle.put(worker)
+        self._lock = threading.Lock()
+        self._queued = 0
+
+    def status(self) -> dict:
+        with self._lock:
+            queued = self._queued
+        idle = self._idle.qsize()
+        return {'workers': len(self._workers), 'busy': len(self._workers) - idle, 'queued': queued,
+                'max_queued': self.max_queued, 'templates': self.templates}
+
+    def render(self, job: dict) -> tuple[int, bytes]:
+        """
+        Renders a job on the first free worker.
+
+        Args:
+            job (dict): The job, as returned by _parse_job.
+
+        Returns:
+            tuple[int, bytes]: HTTP status and response body.
+        """
+        try:
+            worker = self._idle.get_nowait()
+        except queue.Empty:
+            # Only the jobs that have to wait for a worker count as queued
+            with self._lock:
+                if self._queued >= self.max_queued:
+                    return HTTPStatus.SERVICE_UNAVAILABLE, b"Too many queued jobs"
+                self._queued += 1
+            try:
+                worker = self._idle.get()
+            finally:
+                with self._lock:
+                    self._queued -= 1
+
+        try:
+            return worker.render(job)
+        finally:
+            self._idle.put(worker)
+
+    def close(self) -> None:
+        for worker in self._workers:
+            worker.stop()
+
+
+def _is_int(value) -> bool:
+    # JSON true and false are ints in Python
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def _parse_job(payload: dict, templates: list[str]) -> dict:
+    """
+    Validates a render request and fills in the defaults.
+
+    Args:
+        payload (dict): The decoded JSON body of the request.
+        templates (list[str]): Preloaded templates; the first one is used when the request does not give one.
+
+    Returns:
+        dict: The job ('year', 'months', 'template', 'profile', 'format').
+
+    Raises:
+        ValueError: If the request is not valid.
+    """
+    year = payload.get('year')
+    if not _is_int(year) or not 1 <= year <= 9998:
+        raise ValueError("'year' must be an integer")
+
+    months = payload.get('months')
+    if months is not None:
+        if (not isinstance(months, list) or len(months) != 2 or not all(_is_int(m) for m in months)
+                or not 1 <= months[0] <= months[1] <= 12):
+            raise ValueError("'months' must be [first_month, last_month], between 1 and 12")
+        months = tuple(months)
+
+    template = payload.get('template') or (templates[0] if templates else None)
+    if not template:
+        raise ValueError("'template' is required when the daemon has no preloaded template")
+    if not isinstance(template, str):
+        raise ValueError("'template' must be a path")
+    template = os.path.abspath(template)
+    if not os.path.isfile(template):
+        raise ValueError(f"Template '{template}' does not exist")
+
+    profile = payload.get('profile', 'rmk')
+    if not isinstance(profile, str) or profile not in PAGE_PROFILES:
+        raise ValueError(f"'profile' must be one of {', '.join(PAGE_PROFILES)}")
+
+    output_format = payload.get('format', 'odt')
+    if not isinstance(output_format, str) or output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"'format' must be one of {', '.join(OUTPUT_FORMATS)}")
+
+    return {'year': year, 'months': months, 'template': template, 'profile': profile, 'format': output_format}
+
+
+class _RenderHandler(BaseHTTPRequestHandler):
+
+    def _send(self, status: int, body: bytes, content_type: str = 'text/plain; charset=utf-8') -> None:
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        if self.path != '/status':
+            self._send(HTTPStatus.NOT_FOUND, b"Not found")
+            return
+        self._send(HTTPStatus.OK, json.dumps(self.server.pool.status()).encode(), 'application/json')
+
+    def do_POST(self) -> None:
+        if self.path != '/render':
+            self._send(HTTPStatus.NOT_FOUND, b"Not found")
+            return
+
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            payload = json.loads(self.rfile.read(length) or b'{}')
+            if not isinstance(payload, dict):
+                raise ValueError("The request body must be a JSON object")
+            job = _parse_job(payload, self.server.pool.templates)
+        except ValueError as e:
+            self._send(HTTPStatus.BAD_REQUEST, str(e).encode())
+            return
+
+        status, body = self.server.pool.render(job)
+        if status == HTTPStatus.OK:
+            self._send(status, body, OUTPUT_FORMATS[job['format']][1])
+        else:
+            self._send(status, body)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Serve agenda builds from a pool of warm headless LibreOffice "
+                                                 "instances.")
+    parser.add_argument('--host', default=DAEMON_HOST, help="address to listen on (default: %(default)s)")
+    parser.add_argument('--port', type=int, default=DAEMON_PORT, help="port to listen on (default: %(default)s)")
+    parser.add_argument('--workers', type=int, default=WORKERS,
+                        help="number of office instances, i.e. concurrent jobs (default: %(default)s)")
+    parser.add_argument('--max-queue', type=int, default=MAX_QUEUED_JOBS,
+                        help="jobs waiting for a free instance before new ones are rejected (default: %(default)s)")
+    parser.add_argument('--soffice', default=SOFFICE_PATH, help="LibreOffice executable (default: %(default)s)")
+    parser.add_argument('--template', action='append', default=[],
+                        help="daily template to preload; can be repeated, the first one is the default")
+    args = parser.parse_args()
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.max_queue < 0:
+        parser.error("--max-queue cannot be negative")
+
+    # A template that cannot be preloaded would make every office instance fail to start
+    templates = [os.path.abspath(t) for t in args.template]
+    for template in templates:
+        errors, warnings = check_template(template)
+        for problem in errors + warnings:
+            print(f"{template}: {problem}", file=sys.stderr)
+        if errors:
+            sys.exit(1)
+
+    pool = RenderPool(args.workers, args.max_queue, args.soffice, templates)
+    server = ThreadingHTTPServer((args.host, args.port), _RenderHandler)
+    server.pool = pool
+    print(f"Serving agenda builds on http://{args.host}:{args.port} with {args.workers} office instances")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,49 +1,23 @@
 import calendar
 import datetime
 from string import ascii_uppercase
-import uno
-
-from com.sun.star.awt import FontWeight
-from com.sun.star.awt.PosSize import POSSIZE
-from com.sun.star.beans import PropertyValue
-from com.sun.star.style.BreakType import PAGE_AFTER, PAGE_BEFORE
-from com.sun.star.style.ParagraphAdjust import CENTER as HOR_CENTER
-from com.sun.star.table import BorderLine2
-from com.sun.star.table.BorderLineStyle import SOLID
-from com.sun.star.text import ControlCharacter
-from com.sun.star.text.VertOrientation import CENTER as VER_CENTER
-
-
-# variables for page configuration (reMarkable)
-# Margins for the page ('top', 'bottom', 'left', 'right').
-PAGE_MARGINS = {'top': 400, 'bottom': 400, 'left': 1300, 'right': 400}
-PAGE_SIZE = {'width': 15770, 'height': 21030}  # Page size ('width', 'height').
-LINK_COLOR = "6776679"  # Hyperlink color
-LINK_UNDERLINE = False  # Whether hyperlinks are underlined.
-
-# variables for default text style and border styles for month headers in the monthly agenda
-MONTH_HEADER_CHAR_HEIGHT = 12  # Font size for month headers
-MONTH_HEADER_FONT_NAME = 'Open Sans'  # Font name for month headers
-MONTH_HEADER_FONT_WEIGHT = FontWeight.NORMAL  # Font weight for month headers
-MONTH_HEADER_COLOR = "6776679"  # Font color for month headers
-MONTH_HEADER_ALIGN = HOR_CENTER  # Paragraph alignment for month headers
-
-# Border style variables
-MONTH_TABLE_BORDER_COLOR = "6776679"  # Border color for month tables
-MONTH_TABLE_BOTTOM_INNER_WIDTH = 10  # Inner line width for bottom border
-MONTH_TABLE_BOTTOM_LINE_DISTANCE = 0  # Line distance for bottom border
-MONTH_TABLE_BOTTOM_LINE_WIDTH = 5  # Line width for bottom border
-MONTH_TABLE_BOTTOM_OUTER_WIDTH = 0  # Outer line width for bottom border
-MONTH_TABLE_LINE_STYLE = SOLID  # Line style for borders
+
+from AgendaBackend import get_backend
+from AgendaCore import (
+    CALENDAR_COLUMNS_COUNT, CALENDAR_ROWS_COUNT, HOR_CENTER, LINK_COLOR, LINK_UNDERLINE, MONTH_HEADER_ALIGN,
+    MONTH_HEADER_CHAR_HEIGHT, MONTH_HEADER_COLOR, MONTH_HEADER_FONT_NAME, MONTH_HEADER_FONT_WEIGHT,
+    MONTH_TABLE_BORDER_COLOR, MONTH_TABLE_BOTTOM_INNER_WIDTH, MONTH_TABLE_BOTTOM_LINE_DISTANCE,
+    MONTH_TABLE_BOTTOM_LINE_WIDTH, MONTH_TABLE_BOTTOM_OUTER_WIDTH, MONTH_TABLE_LINE_STYLE, PAGE_AFTER, PAGE_BEFORE,
+    PAGE_MARGINS, PAGE_PROFILES, PAGE_SIZE, POSSIZE, TEMPLATE_CALENDAR_ICON, TEMPLATE_CALENDAR_TABLE,
+    TEMPLATE_DAY_TABLE, TEMPLATE_PLACEHOLDERS, VER_CENTER, ControlCharacter, FontWeight, daily_date_range, daterange,
+    day_link, month_calendars, month_days, month_link, yearly_calendar_layout,
+)
 
 
 def _get_office_context():
     """
-        Obtain the UNO component context, desktop, service manager, and the current Writer document model for 
-        LibreOffice.
-
-        Tries to use the XSCRIPTCONTEXT if available (when running as a macro inside LibreOffice).
-        If not available, connects to a running LibreOffice instance via socket.
+        Obtain the UNO component context, desktop, service manager, and the current Writer document model from the
+        current document backend.
 
         Returns:
             tuple: (ctx, desktop, smgr, model)
@@ -52,33 +26,32 @@ def _get_office_context():
                 smgr: The UNO service manager.
                 model: The current Writer document model.
         """
-    try:
-        desktop = XSCRIPTCONTEXT.getDesktop()
-        ctx = XSCRIPTCONTEXT.getComponentContext()
-        smgr = ctx.getServiceManager()
+    return _get_backend().get_context()
 
-    except NameError:
-        # get the uno component context from the PyUNO runtime
-        local_context = uno.getComponentContext()
 
-        # create the UnoUrlResolver
-        resolver = local_context.ServiceManager.createInstanceWithContext("com.sun.star.bridge.UnoUrlResolver",
-                                                                         local_context)
+def _get_backend():
+    """
+    Returns the current document backend, handing the XSCRIPTCONTEXT to it when running as a macro inside
+    LibreOffice (it is only defined in the globals of the module run as a macro).
+    """
+    try:
+        script_context = XSCRIPTCONTEXT
+    except NameError:
+        script_context = None
+    return get_backend(script_context)
 
-        # connect to the running office
-        ctx = resolver.resolve("uno:socket,host=localhost,port=2002;urp;StarOffice.ComponentContext")
-        smgr = ctx.ServiceManager
 
-        # get the central desktop object
-        desktop = smgr.createInstanceWithContext("com.sun.star.frame.Desktop", ctx)
+def _enum(value: tuple[str, str]):
+    """
+    Creates a UNO enum value through the current backend.
 
-    # Check whether there's already an opened document.
-    # Otherwise, create a new one
-    model = desktop.getCurrentComponent()
-    if not hasattr(model, "Text"):
-        model = desktop.loadComponentFromURL("private:factory/swriter", "_blank", 0, ())
+    Args:
+        value (tuple[str, str]): Type name and value name of the enum (e.g., PAGE_AFTER).
 
-    return ctx, desktop, smgr, model
+    Returns:
+        The enum value.
+    """
+    return _get_backend().enum(*value)
 
 
 def _add_awt_model(dialog_model, srv, control_name, control_prop):
@@ -98,7 +71,7 @@ def _add_awt_model(dialog_model, srv, control_name, control_prop):
     control_model = dialog_model.createInstance("com.sun.star.awt.UnoControl" + srv + "Model")
     while control_prop:
         prp = control_prop.popitem()
-        uno.invoke(control_model, "setPropertyValue", (prp[0], prp[1]))
+        _get_backend().invoke(control_model, "setPropertyValue", (prp[0], prp[1]))
         # works with awt.UnoControlDialogElement only:
         control_model.Name = control_name
     dialog_model.insertByName(control_name, control_model)
@@ -179,22 +152,6 @@ def _rgb_to_long(rgb_color: tuple[int, int, int]) -> int:
     # return int(f'{r:02x}{g:02x}{b:02x}', 16)
     return r * 65536 + g * 256 + b
 
-def _daterange(start_date: datetime.date, end_date: datetime.date):
-    """
-    Generator that yields each date from start_date up to, but not including, end_date.
-
-    Args:
-        start_date (datetime.date or datetime.datetime): The start date (inclusive).
-        end_date (datetime.date or datetime.datetime): The end date (not included).
-
-    Yields:
-        datetime.date or datetime.datetime: Each date in the range.
-    """
-    days = int((end_date - start_date).days)
-    for n in range(days):
-        yield start_date + datetime.timedelta(n)
-
-
 def generate_all() -> None:
     """
     Generates the complete agenda document in LibreOffice Writer. Configures the page for the reMarkable and
@@ -212,23 +169,40 @@ def generate_all() -> None:
     template = _get_template(smgr)
     # template = r"C:\Users\Leire\Google Drive\agenda\remarkable\template_rmk_2.odt"
 
-    configure_page_for_rmk()
+    generate_agenda(year, template)
+
+
+def generate_agenda(year: int, template_path: str, months: tuple[int, int] = None, profile: str = 'rmk') -> None:
+    """
+    Generates the complete agenda document without prompting the user. Configures the page with the given
+    profile and generates the title page, yearly calendar, monthly agenda, and daily agenda.
+
+    Args:
+        year (int): The year for which to generate the agenda.
+        template_path (str): Full path to the daily template file.
+        months (tuple[int, int], optional): Starting and ending month of the daily pages. If None, the whole year.
+        profile (str, optional): Name of the page profile in PAGE_PROFILES (default is 'rmk').
+
+    Returns:
+        None
+    """
+    page_profile = PAGE_PROFILES[profile]
+
+    configure_page(page_profile['margins'], page_profile['size'])
     generate_title_page(year)
     generate_calendar(year)
     generate_monthly_agenda(year)
-    generate_daily_agenda(year, template_path=template)
+    generate_daily_agenda(year, months=months, template_path=template_path)
 
 
-def configure_page_for_rmk() -> None:
+def configure_page(margins: dict, size: dict) -> None:
     """
-    Configures the page layout in LibreOffice Writer for reMarkable devices using global variables.
-    Sets custom page margins, page size, and hyperlink style based on the global configuration.
+    Configures the page layout in LibreOffice Writer with the given margins and size, and sets the hyperlink
+    style based on the global configuration.
 
-    Uses:
-        RMK_MARGINS (dict): Margins for the page ('top', 'bottom', 'left', 'right').
-        RMK_SIZE (dict): Page size ('width', 'height').
-        RMK_LINK_COLOR (str): Hyperlink color.
-        RMK_LINK_UNDERLINE (bool): Whether hyperlinks are underlined.
+    Args:
+        margins (dict): Margins for the page ('top', 'bottom', 'left', 'right').
+        size (dict): Page size ('width', 'height').
     """
     ctx, desktop, smgr, model = _get_office_context()
 
@@ -236,13 +210,13 @@ def configure_page_for_rmk() -> None:
     page_style_name = view_cursor.PageStyleName
     style = model.StyleFamilies.getByName("PageStyles").getByName(page_style_name)
 
-    style.TopMargin = PAGE_MARGINS['top']
-    style.BottomMargin = PAGE_MARGINS['bottom']
-    style.LeftMargin = PAGE_MARGINS['left']
-    style.RightMargin = PAGE_MARGINS['right']
+    style.TopMargin = margins['top']
+    style.BottomMargin = margins['bottom']
+    style.LeftMargin = margins['left']
+    style.RightMargin = margins['right']
 
-    style.Width = PAGE_SIZE['width']
-    style.Height = PAGE_SIZE['height']
+    style.Width = size['width']
+    style.Height = size['height']
 
     # Edit hyperlink style
     link_style = model.StyleFamilies.CharacterStyles.getByName('Internet link')
@@ -250,6 +224,20 @@ def configure_page_for_rmk() -> None:
     link_style.CharUnderline = LINK_UNDERLINE
 
 
+def configure_page_for_rmk() -> None:
+    """
+    Configures the page layout in LibreOffice Writer for reMarkable devices using global variables.
+    Sets custom page margins, page size, and hyperlink style based on the global configuration.
+
+    Uses:
+        RMK_MARGINS (dict): Margins for the page ('top', 'bottom', 'left', 'right').
+        RMK_SIZE (dict): Page size ('width', 'height').
+        RMK_LINK_COLOR (str): Hyperlink color.
+        RMK_LINK_UNDERLINE (bool): Whether hyperlinks are underlined.
+    """
+    configure_page(PAGE_MARGINS, PAGE_SIZE)
+
+
 def generate_title_page(year: int = None) -> None:
     """
     Generates the title page for the agenda document in LibreOffice Writer.
@@ -279,12 +267,12 @@ def generate_title_page(year: int = None) -> None:
     text.End.CharFontName = 'Open Sans'
     text.End.CharWeight = FontWeight.BOLD
     text.End.CharColor = "6776679"
-    text.End.ParaAdjust = HOR_CENTER
+    text.End.ParaAdjust = _enum(HOR_CENTER)
     text.End.String = f"\n{s_year}"
 
     cursor = text.createTextCursor()
     cursor.gotoEnd(False)
-    cursor.BreakType = PAGE_AFTER
+    cursor.BreakType = _enum(PAGE_AFTER)
     text.insertControlCharacter(cursor.End, ControlCharacter.PARAGRAPH_BREAK, False)
 
 
@@ -316,22 +304,11 @@ def generate_calendar(year: int = None) -> None:
     text.End.CharFontName = 'Open Sans'
     text.End.CharWeight = FontWeight.NORMAL
     text.End.CharColor = "6776679"
-    text.End.ParaAdjust = HOR_CENTER
+    text.End.ParaAdjust = _enum(HOR_CENTER)
     text.End.String = f"CALENDAR {s_year}"
 
-    # Table configuration
-    col_month = [0] * 7 + [None] + [1] * 7 + [None] + [2] * 7
-    row_month = (
-        [None, None] + [0] * 6 + [None] +
-        [None, None] + [1] * 6 + [None] +
-        [None, None] + [2] * 6 + [None] +
-        [None, None] + [3] * 6 + [None]
-    )
-    calendar_rows_count = 36  # weeks in a month (6) * number of months/3 (4) + 3 separators for each month row (12)
-    calendar_column_count = 23  # days of week (7) * number of months in row (3) + 2 separators
-    week_day_header = calendar.weekheader(1).split(" ")
-    split_chunks = lambda lst, sz: [lst[i:i + sz] for i in range(0, len(lst), sz)]
-    month_header = split_chunks(calendar.month_name[1:], 3)
+    calendar_rows_count = CALENDAR_ROWS_COUNT
+    calendar_column_count = CALENDAR_COLUMNS_COUNT
     calendar_table_name = "YearlyCalendarTable"
 
     # Create the table
@@ -348,11 +325,11 @@ def generate_calendar(year: int = None) -> None:
     cursor.CharFontName = 'Open Sans'
     cursor.CharWeight = FontWeight.NORMAL
     cursor.CharColor = "6776679"
-    cursor.ParaAdjust = HOR_CENTER
+    cursor.ParaAdjust = _enum(HOR_CENTER)
     _format_whole_table(calendar_table, calendar_rows_count, calendar_column_count, VER_CENTER)
 
     # Remove all borders
-    no_line = BorderLine2()
+    no_line = _get_backend().create_struct("com.sun.star.table.BorderLine2")
     table_border = calendar_table.TableBorder
     table_border.LeftLine = no_line
     table_border.RightLine = no_line
@@ -362,47 +339,29 @@ def generate_calendar(year: int = None) -> None:
     table_border.VerticalLine = no_line
     calendar_table.TableBorder = table_border
 
-    # Fill the table with month names, weekdays, and days
-    for row_i in range(calendar_rows_count):
-        row_type_index = row_i % 9
-        month_row_idx = row_month[row_i]  # Index of the month in this row
+    # Fill the table row by row with month names, weekdays, and days
+    layout = yearly_calendar_layout(year)
+    month_rows = dict(layout.month_rows)
+    row_cells = {}
+    for cell in layout.cells:
+        row_cells.setdefault(cell[1], []).append(cell)
 
-        if row_type_index == 0:  # Month name row
-            month_row_i = int(row_i / 9)
+    for row_i in range(CALENDAR_ROWS_COUNT):
+        if row_i in month_rows:
             # Merge and set month names for each of the 3 months in the row
-            for col, col_name in zip([0, 2, 4], range(3)):
+            for col, month_name in zip([0, 2, 4], month_rows[row_i]):
                 cursor = calendar_table.createCursorByCellName(f"{chr(65 + col)}{row_i + 1}")
                 cursor.goRight(6, True)
                 cursor.mergeRange()
-                calendar_table.getCellByPosition(col, row_i).setString(f"{month_header[month_row_i][col_name]}")
-        else:
-            for col_i in range(calendar_column_count):
-                day_of_week_idx = col_i % 8
-                month_col_idx = col_month[col_i]  # Index of the month in this column
-
-                if month_col_idx is None:
-                    continue  # Separator column
-
-                if month_row_idx is not None:
-                    # Day cell: fill with day number and hyperlink
-                    month = 3 * month_row_idx + month_col_idx + 1  # get the month
-                    week_number = row_type_index - 2
-                    month_calendar_list = list(calendar.monthcalendar(year, month))
-                    try:
-                        day = month_calendar_list[week_number][day_of_week_idx]
-                        if day != 0:  # do not add days that do not belong to the month
-                            datetime_day = datetime.datetime(year, month, day)
-                            day_of_year = datetime_day.timetuple().tm_yday
-                            calendar_table.getCellByPosition(col_i, row_i).setString(f"{day}")
-                            cell_cursor = calendar_table.getCellByPosition(col_i, row_i).createTextCursor()
-                            cell_cursor.gotoStart(False)
-                            cell_cursor.gotoEnd(True)
-                            cell_cursor.HyperLinkURL = f'#DayTable{day_of_year}|table'
-                    except IndexError:
-                        pass
-                elif row_type_index == 1:
-                    # Weekday header row (M, T, W, T, F, S, S)
-                    calendar_table.getCellByPosition(col_i, row_i).setString(week_day_header[day_of_week_idx])
+                calendar_table.getCellByPosition(col, row_i).setString(month_name)
+
+        for col_i, _, value, link in row_cells.get(row_i, ()):
+            calendar_table.getCellByPosition(col_i, row_i).setString(value)
+            if link:
+                cell_cursor = calendar_table.getCellByPosition(col_i, row_i).createTextCursor()
+                cell_cursor.gotoStart(False)
+                cell_cursor.gotoEnd(True)
+                cell_cursor.HyperLinkURL = link
 
     calendar_table.TableName = calendar_table_name
     return None
@@ -432,12 +391,12 @@ def generate_monthly_agenda(year: int = None) -> None:
     text.End.CharFontName = MONTH_HEADER_FONT_NAME
     text.End.CharWeight = MONTH_HEADER_FONT_WEIGHT
     text.End.CharColor = MONTH_HEADER_COLOR
-    text.End.ParaAdjust = MONTH_HEADER_ALIGN
+    text.End.ParaAdjust = _enum(MONTH_HEADER_ALIGN)
 
     # Define border styles
-    no_line = BorderLine2()
+    no_line = _get_backend().create_struct("com.sun.star.table.BorderLine2")
 
-    bottom_line = BorderLine2()
+    bottom_line = _get_backend().create_struct("com.sun.star.table.BorderLine2")
     bottom_line.Color = MONTH_TABLE_BORDER_COLOR
     bottom_line.InnerLineWidth = MONTH_TABLE_BOTTOM_INNER_WIDTH
     bottom_line.LineDistance = MONTH_TABLE_BOTTOM_LINE_DISTANCE
@@ -445,17 +404,16 @@ def generate_monthly_agenda(year: int = None) -> None:
     bottom_line.OuterLineWidth = MONTH_TABLE_BOTTOM_OUTER_WIDTH
     bottom_line.LineStyle = MONTH_TABLE_LINE_STYLE
 
-    week_day_header = calendar.weekheader(1).split(" ")
-
     for month_num, month in enumerate(calendar.month_name[1:], 1):
         # Insert a page break before each month
         cursor = text.createTextCursor()
         cursor.gotoEnd(False)
-        cursor.BreakType = PAGE_BEFORE
+        cursor.BreakType = _enum(PAGE_BEFORE)
 
         # Insert month name as header
         text.End.String = month
-        _, days_count = calendar.monthrange(year, month_num)
+        days = month_days(year, month_num)
+        days_count = len(days)
 
         # Create and insert the table for the month
         month_table = model.createInstance("com.sun.star.text.TextTable")
@@ -471,7 +429,7 @@ def generate_monthly_agenda(year: int = None) -> None:
         cursor.CharFontName = 'Open Sans'
         cursor.CharWeight = FontWeight.NORMAL
         cursor.CharColor = "6776679"
-        cursor.ParaAdjust = HOR_CENTER
+        cursor.ParaAdjust = _enum(HOR_CENTER)
         _format_whole_table(month_table, days_count, 3, orientation=VER_CENTER)
 
         # Set table borders
@@ -491,26 +449,21 @@ def generate_monthly_agenda(year: int = None) -> None:
         month_table.TableColumnSeparators = sep
 
         # Fill table with days and hyperlinks
-        for day_idx in range(days_count):
-            day = day_idx + 1
-            datetime_day = datetime.datetime(year, month_num, day)
-            day_of_year = datetime_day.timetuple().tm_yday
-            week_day = datetime.datetime(year, month_num, day).weekday()
-
+        for day_idx, (day, week_day, link) in enumerate(days):
             month_table.getCellByPosition(0, day_idx).setString(day)
-            month_table.getCellByPosition(1, day_idx).setString(week_day_header[week_day])
+            month_table.getCellByPosition(1, day_idx).setString(week_day)
 
             cell_cursor = month_table.getCellByPosition(0, day_idx).createTextCursor()
             cell_cursor.gotoStart(False)
             cell_cursor.gotoEnd(True)
-            cell_cursor.HyperLinkURL = f'#DayTable{day_of_year}|table'
+            cell_cursor.HyperLinkURL = link
 
         month_table.TableName = f"MontlyAgenda{month}Table"
 
     # Insert a page break at the end
     cursor = text.createTextCursor()
     cursor.gotoEnd(False)
-    cursor.BreakType = PAGE_BEFORE
+    cursor.BreakType = _enum(PAGE_BEFORE)
 
     text.insertControlCharacter(cursor.End, ControlCharacter.PARAGRAPH_BREAK, False)
 
@@ -542,10 +495,9 @@ def generate_daily_agenda(year: int = None, months: tuple[int, int] = None, temp
     if not template_path:
         template_path = _get_template(smgr)
 
-    # Load the template document and get the day table
-    file_url = uno.systemPathToFileUrl(template_path)
-    template_doc = desktop.loadComponentFromURL(file_url, "_blank", 0, ())
-    template_table = template_doc.getTextTables().getByName("DayTable")
+    # Load the template document (or reuse the preloaded one) and get the day table
+    template_doc = _get_backend().load_template(template_path)
+    template_table = template_doc.getTextTables().getByName(TEMPLATE_DAY_TABLE)
 
     # Prepare dispatcher and select the table in the template
     dispatcher = smgr.createInstanceWithContext("com.sun.star.frame.DispatchHelper", ctx)
@@ -564,34 +516,19 @@ def generate_daily_agenda(year: int = None, months: tuple[int, int] = None, temp
     cursor.gotoEnd(False)
 
     # Prepare monthly calendars for all months
-    month_calendars = [None] * 13
-    for month_num in range(1, 13):
-        month_calendar = list(calendar.monthcalendar(year, month_num))
-        month_calendar.insert(0, calendar.weekheader(1).split(" "))
-        month_calendar = [list(map(lambda x: x if x != 0 else '', i)) for i in month_calendar]
-        while len(month_calendar) < 7:
-            month_calendar.append([''] * 7)
-        month_calendars[month_num] = month_calendar
+    calendars = month_calendars(year)
 
     # Determine the date range to generate
-    if test:
-        first_day = datetime.datetime(year, 8, 31)
-        last_day = datetime.datetime(year, 9, 3)
-    elif months:
-        first_day = datetime.datetime(year, months[0], 1)
-        last_day = datetime.datetime(year + 1, months[1] + 1, 1)
-    else:
-        first_day = datetime.datetime(year, 1, 1)
-        last_day = datetime.datetime(year + 1, 1, 1)
+    first_day, last_day = daily_date_range(year, months, test)
 
-    for day in _daterange(first_day, last_day):
+    for day in daterange(first_day, last_day):
         day_num = day.day
         month_num = day.month
         month = calendar.month_name[month_num]
         week_day = calendar.day_name[day.weekday()]
         week_number = day.isocalendar().week
         day_of_year = day.timetuple().tm_yday
-        month_calendar = month_calendars[month_num]
+        month_calendar = calendars[month_num]
 
         # Insert month header and page break at the start of each month
         if day_num == 1:
@@ -601,20 +538,20 @@ def generate_daily_agenda(year: int = None, months: tuple[int, int] = None, temp
             text.End.CharFontName = 'Open Sans'
             text.End.CharWeight = FontWeight.BOLD
             text.End.CharColor = "6776679"
-            text.End.ParaAdjust = HOR_CENTER
+            text.End.ParaAdjust = _enum(HOR_CENTER)
             text.End.String = month
 
         # Paste the copied table from the template
         model.getCurrentController().insertTransferable(frame.Controller.getTransferable())
 
         text_tables = model.TextTables
-        day_table = text_tables.getByName("DayTable")
-        day_table.TableName = f"DayTable{day_of_year}"
+        day_table = text_tables.getByName(TEMPLATE_DAY_TABLE)
+        day_table.TableName = f"{TEMPLATE_DAY_TABLE}{day_of_year}"
 
         search_cursor = day_table.getCellByName("A1").createTextCursor()
 
         # Insert hyperlinks for navigation
-        calendar_icon = model.GraphicObjects.getByName("CalendarIcon")
+        calendar_icon = model.GraphicObjects.getByName(TEMPLATE_CALENDAR_ICON)
         calendar_icon.HyperLinkURL = '#YearlyCalendarTable|table'
         calendar_icon.setName(f"DailyCalendarIcon{day_of_year}")
 
@@ -623,42 +560,28 @@ def generate_daily_agenda(year: int = None, months: tuple[int, int] = None, temp
             search.setSearchString(calendar.month_abbr[cal_month_num].upper())
             found = model.findNext(search_cursor, search)
             if found:
-                found.HyperLinkURL = f'#MontlyAgenda{cal_month}Table|table'
+                found.HyperLinkURL = month_link(cal_month_num)
             else:
                 print("E")
 
-        # Replace placeholders in the template
-        replace = model.createReplaceDescriptor()
-        replace.setSearchString("<d")
-        replace.setReplaceString(str(day_num))
-        model.replaceAll(replace)
-
-        replace = model.createReplaceDescriptor()
-        replace.setSearchString("<MONTH>")
-        replace.setReplaceString(month)
-        model.replaceAll(replace)
-
-        replace = model.createReplaceDescriptor()
-        replace.setSearchString("<WEEKDAY>")
-        replace.setReplaceString(week_day)
-        model.replaceAll(replace)
-
-        replace = model.createReplaceDescriptor()
-        replace.setSearchString("<WEEKNUMBER>")
-        replace.setReplaceString(week_number)
-        model.replaceAll(replace)
+        # Replace placeholders in the template (day, month, weekday, week number)
+        for placeholder, value in zip(TEMPLATE_PLACEHOLDERS, (str(day_num), month, week_day, week_number)):
+            replace = model.createReplaceDescriptor()
+            replace.setSearchString(placeholder)
+            replace.setReplaceString(value)
+            model.replaceAll(replace)
 
         # Insert a page break after each day
         cursor = model.getCurrentController().getViewCursor()
         cursor.gotoEnd(False)
         cursor = text.createTextCursor()
         cursor.gotoEnd(False)
-        cursor.BreakType = PAGE_AFTER
+        cursor.BreakType = _enum(PAGE_AFTER)
         text.End.String = " "
 
         # Update the calendar table if present
-        if text_tables.hasByName("CalendarTable"):
-            calendar_table = text_tables.getByName("CalendarTable")
+        if text_tables.hasByName(TEMPLATE_CALENDAR_TABLE):
+            calendar_table = text_tables.getByName(TEMPLATE_CALENDAR_TABLE)
             calendar_table.setDataArray(month_calendar)
             calendar_table.TableName = f"DailyCalendarTable{day_of_year}"
 
@@ -676,12 +599,9 @@ def generate_daily_agenda(year: int = None, months: tuple[int, int] = None, temp
                                 )
                                 cell_cursor.CharWeight = FontWeight.BOLD
 
-                            calendar_day_datetime = datetime.datetime(year, month_num, int(value))
-                            calendar_day_of_year = calendar_day_datetime.timetuple().tm_yday
-
                             cell_cursor = calendar_table.getCellByPosition(column_idx, row_idx).createTextCursor()
                             cell_cursor.gotoStart(False)
                             cell_cursor.gotoEnd(True)
-                            cell_cursor.HyperLinkURL = f'#DayTable{calendar_day_of_year}|table'
+                            cell_cursor.HyperLinkURL = day_link(datetime.date(year, month_num, int(value)))
 
-    template_doc.close(True)
+    _get_backend().close_template(template_doc)
@@ -0,0 +1,1012 @@
+"""
+In-memory document backend.
+
+Mimics the subset of the UNO API used by the generators (text, TextTables, cells, cursors, search/replace,
+GraphicObjects, hyperlinks) without LibreOffice, and records every operation performed, so the generators can be
+run and profiled in milliseconds and the resulting structure asserted exactly:
+
+    backend = MemoryBackend()
+    set_backend(backend)
+    generate_monthly_agenda(2025)
+    backend.document.TextTables.getByName("MontlyAgendaMarchTable").getCellByName("A2").getString()  # '2'
+    backend.document.hyperlinks()  # [('MontlyAgendaJanuaryTable.A1', '1', '#DayTable1|table'), ...]
+
+Running this module profiles the generators for a year:
+
+    python MemoryBackend.py 2025
+"""
+import argparse
+import collections
+import copy
+import itertools
+import pathlib
+import re
+import time
+from string import ascii_uppercase
+
+from AgendaBackend import DocumentBackend
+from AgendaCore import DEFAULT_TEMPLATE, read_template_tables
+
+
+Operation = collections.namedtuple('Operation', 'target action args')  # Recorded operation
+Enum = collections.namedtuple('Enum', 'typeName value')  # Same attributes as uno.Enum
+
+
+class Struct:
+    """
+    UNO struct with the given type name. Fields are created when they are set.
+    """
+
+    def __init__(self, type_name: str, **fields):
+        self.typeName = type_name
+        self.__dict__.update(fields)
+
+    def __eq__(self, other):
+        return isinstance(other, Struct) and self.__dict__ == other.__dict__
+
+    def __repr__(self):
+        fields = ', '.join(f'{k}={v!r}' for k, v in self.__dict__.items() if k != 'typeName')
+        return f'{self.typeName.rsplit(".", 1)[-1]}({fields})'
+
+
+def _cell_name(column: int, row: int) -> str:
+    return f"{ascii_uppercase[column]}{row + 1}"
+
+
+def _cell_position(cell_name: str) -> tuple[int, int]:
+    return ascii_uppercase.index(cell_name[0]), int(cell_name[1:]) - 1
+
+
+class _FakeObject:
+    """
+    Base of the fake UNO objects. UNO properties (capitalised attributes) are stored in `properties` and every
+    assignment is recorded in the operation log shared by all the objects of a backend.
+    """
+
+    def __init__(self, log: list):
+        object.__setattr__(self, 'log', log)
+        object.__setattr__(self, 'properties', {})
+
+    @property
+    def label(self) -> str:
+        return type(self).__name__
+
+    def _record(self, action: str, *args) -> None:
+        self.log.append(Operation(self.label, action, args))
+
+    def _set_property(self, name: str, value) -> None:
+        self.properties[name] = value
+
+    def __setattr__(self, name, value):
+        if not name[:1].isupper():
+            object.__setattr__(self, name, value)
+            return
+        self._record('set', name, value)
+        if isinstance(getattr(type(self), name, None), property):
+            object.__setattr__(self, name, value)
+        else:
+            self._set_property(name, value)
+
+    def __getattr__(self, name):
+        # only called for attributes that do not exist, i.e. properties
+        if name[:1].isupper():
+            try:
+                return self.__dict__['properties'][name]
+            except KeyError:
+                pass
+        raise AttributeError(f"{type(self).__name__} has no attribute '{name}'")
+
+
+class _NameAccess:
+    """
+    Named container (XNameAccess / XIndexAccess) over a dict of the document.
+    """
+
+    def __init__(self, items: dict):
+        self._items = items
+
+    def getByName(self, name: str):
+        return self._items[name]
+
+    def hasByName(self, name: str) -> bool:
+        return name in self._items
+
+    def getElementNames(self) -> tuple:
+        return tuple(self._items)
+
+    def getCount(self) -> int:
+        return len(self._items)
+
+    def getByIndex(self, index: int):
+        return list(self._items.values())[index]
+
+    def __getattr__(self, name):
+        # style families can also be reached as attributes (e.g. StyleFamilies.CharacterStyles)
+        if name.startswith('_'):
+            raise AttributeError(name)
+        try:
+            return self._items[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+
+class _TextContainer(_FakeObject):
+    """
+    Paragraph or table cell: a string, its properties and the formatting applied to parts of it.
+    """
+
+    def __init__(self, doc, string: str = ''):
+        super().__init__(doc.log)
+        # set directly, containers are created for every cell of every pasted table
+        self.__dict__.update(
+            doc=doc,
+            text=string,
+            formatting=[],  # (start, end, property name, value)
+            tables=[],  # Tables nested in the container
+        )
+        doc._edited(self)
+
+    def getString(self) -> str:
+        return self.text
+
+    def setString(self, string) -> None:
+        self._record('setString', string)
+        self._set_text(str(string))
+
+    def _set_text(self, string: str) -> None:
+        self.text = string
+        self.formatting = []
+        self.doc._edited(self)
+
+    def createTextCursor(self):
+        return _TextCursor(self)
+
+    def hyperlinks(self) -> list[tuple[str, str]]:
+        """
+        Returns:
+            list[tuple[str, str]]: (linked text, URL) of the hyperlinks in the container.
+        """
+        return [(self.text[start:end], value) for start, end, name, value in self.formatting if name == 'HyperLinkURL']
+
+    def _replace(self, pattern, replace_string: str) -> int:
+        """
+        Replaces the matches of the compiled pattern, keeping the formatting of the rest of the text in place.
+        """
+        matches = list(pattern.finditer(self.text))
+        if not matches:
+            return 0
+
+        # (end of the match, change of length) to move the formatting that comes after each match
+        shifts = [(match.end(), len(replace_string) - (match.end() - match.start())) for match in matches]
+
+        def moved(position):
+            return position + sum(delta for end, delta in shifts if end <= position)
+
+        self.text = pattern.sub(lambda match: replace_string, self.text)
+        self.formatting = [(moved(start), moved(end), name, value) for start, end, name, value in self.formatting]
+        self.doc._edited(self)
+        return len(matches)
+
+    def _containers(self):
+        yield self
+        for table in self.tables:
+            yield from table._containers()
+
+
+class _Paragraph(_TextContainer):
+
+    @property
+    def label(self) -> str:
+        return f"Paragraph{self.doc.Text.blocks.index(self) + 1}" if self in self.doc.Text.blocks else "Paragraph"
+
+
+class _Cell(_TextContainer):
+
+    def __init__(self, doc, table, row: int, string: str = ''):
+        super().__init__(doc, string)
+        self.__dict__.update(table=table, row=row)
+
+    @property
+    def label(self) -> str:
+        return f"{self.table.TableName}.{self.getName()}"
+
+    def getName(self) -> str:
+        # the column changes when cells before it in the row are merged
+        return _cell_name(self.table.rows[self.row].index(self), self.row)
+
+    def getText(self):
+        return self
+
+    def _copy(self, doc, table):
+        cell = _Cell(doc, table, self.row, self.text)
+        cell.properties.update(self.properties)
+        cell.formatting = list(self.formatting)
+        cell.tables = [nested._copy(doc) for nested in self.tables]
+        return cell
+
+
+class _TextRange(_FakeObject):
+    """
+    Part of the text of a container, as returned by findNext. Properties set on it format that part.
+    """
+
+    def __init__(self, container: _TextContainer, start: int, end: int):
+        super().__init__(container.log)
+        self.container = container
+        self.start = start
+        self.end = end
+
+    @property
+    def label(self) -> str:
+        return self.container.label
+
+    def getString(self) -> str:
+        return self.container.text[self.start:self.end]
+
+    def getText(self):
+        return self.container
+
+    def _set_property(self, name, value):
+        self.container.formatting.append((self.start, self.end, name, value))
+
+
+class _TextCursor(_TextRange):
+    """
+    Text cursor inside a paragraph or a cell.
+    """
+
+    def __init__(self, container: _TextContainer):
+        super().__init__(container, 0, 0)
+
+    def gotoStart(self, expand: bool) -> None:
+        self.start = 0
+        if not expand:
+            self.end = 0
+
+    def gotoEnd(self, expand: bool) -> None:
+        self.end = len(self.container.text)
+        if not expand:
+            self.start = self.end
+
+
+class _EndRange(_FakeObject):
+    """
+    End of the body text (Text.End). Properties set on it apply to the last paragraph, strings are appended to it.
+    """
+
+    def __init__(self, body):
+        super().__init__(body.log)
+        self.body = body
+
+    @property
+    def label(self) -> str:
+        return "Text.End"
+
+    @property
+    def String(self) -> str:
+        return ''
+
+    @String.setter
+    def String(self, string: str) -> None:
+        paragraph = self.body.last_paragraph
+        paragraph._set_text(paragraph.text + string)
+
+    def getText(self):
+        return self.body
+
+    def _set_property(self, name, value):
+        self.body.last_paragraph.properties[name] = value
+
+
+class _BodyCursor(_FakeObject):
+    """
+    Text cursor in the body text. Properties set on it apply to the paragraph it is in.
+    """
+
+    def __init__(self, body):
+        super().__init__(body.log)
+        self.body = body
+        self.paragraph = body.blocks[0]
+
+    @property
+    def label(self) -> str:
+        return "TextCursor"
+
+    @property
+    def End(self):
+        return _EndRange(self.body)
+
+    def gotoStart(self, expand: bool) -> None:
+        self.paragraph = self.body.blocks[0]
+
+    def gotoEnd(self, expand: bool) -> None:
+        self.paragraph = self.body.last_paragraph
+
+    def _set_property(self, name, value):
+        self.paragraph.properties[name] = value
+
+
+class _Text(_FakeObject):
+    """
+    Body text of a document: a list of paragraphs and tables, always ending with a paragraph.
+    """
+
+    def __init__(self, doc):
+        super().__init__(doc.log)
+        self.doc = doc
+        self.blocks = [_Paragraph(doc)]
+
+    @property
+    def label(self) -> str:
+        return "Text"
+
+    @property
+    def End(self):
+        return _EndRange(self)
+
+    @property
+    def last_paragraph(self) -> _Paragraph:
+        return self.blocks[-1]
+
+    def getText(self):
+        return self
+
+    def createTextCursor(self):
+        return _BodyCursor(self)
+
+    def insertControlCharacter(self, text_range, control_character: int, absorb: bool) -> None:
+        self._record('insertControlCharacter', control_character)
+        self._new_paragraph()
+
+    def insertTextContent(self, text_range, content, absorb: bool) -> None:
+        self._record('insertTextContent', content.label)
+        self._insert_table(content)
+
+    def _new_paragraph(self) -> None:
+        # the new paragraph keeps the character and paragraph attributes, but not the page break
+        properties = {k: v for k, v in self.last_paragraph.properties.items() if k != 'BreakType'}
+        paragraph = _Paragraph(self.doc)
+        paragraph.properties.update(properties)
+        self.blocks.append(paragraph)
+
+    def _insert_table(self, table) -> None:
+        # A table goes before the last paragraph if it is empty, otherwise after it, as Writer does at the end
+        # of the text.
+        self.doc._register_table(table)
+        if self.last_paragraph.text:
+            self.blocks.append(table)
+            self._new_paragraph()
+        else:
+            self.blocks.insert(len(self.blocks) - 1, table)
+
+    def _containers(self):
+        for block in self.blocks:
+            yield from block._containers()
+
+
+class _TableCursor(_FakeObject):
+    """
+    Cursor over a rectangular range of cells. Properties set on it apply to every cell of the range.
+    """
+
+    def __init__(self, table, cell_name: str):
+        super().__init__(table.log)
+        self.table = table
+        self.column, self.row = _cell_position(cell_name)
+        self.columns = 1
+        self.rows = 1
+
+    @property
+    def label(self) -> str:
+        return f"{self.table.TableName}.{self.getRangeName()}"
+
+    def getRangeName(self) -> str:
+        first = _cell_name(self.column, self.row)
+        last = _cell_name(self.column + self.columns - 1, self.row + self.rows - 1)
+        return first if first == last else f"{first}:{last}"
+
+    def goRight(self, count: int, expand: bool) -> bool:
+        if expand:
+            self.columns += count
+        else:
+            self.column += count
+        return True
+
+    def goDown(self, count: int, expand: bool) -> bool:
+        if expand:
+            self.rows += count
+        else:
+            self.row += count
+        return True
+
+    def mergeRange(self) -> bool:
+        if self.rows != 1:
+            raise NotImplementedError("only ranges within one row can be merged")
+        self._record('mergeRange')
+        row = self.table.rows[self.row]
+        merged = row[self.column:self.column + self.columns]
+        row[self.column:self.column + self.columns] = merged[:1]
+        self.table.merged.append((self.table.TableName, self.getRangeName()))
+        self.columns = 1
+        return True
+
+    def _cells(self):
+        for row in self.table.rows[self.row:self.row + self.rows]:
+            yield from row[self.column:self.column + self.columns]
+
+    def _set_property(self, name, value):
+        for cell in self._cells():
+            cell.properties[name] = value
+
+
+class _TextTable(_FakeObject):
+    """
+    Text table. Cells are kept by row, so merging cells in a row renames the following ones as Writer does.
+    """
+
+    def __init__(self, doc):
+        super().__init__(doc.log)
+        self.doc = doc
+        self.name = ''
+        self.rows = []
+        self.merged = []  # (table name when merged, merged range)
+        self.properties['TableBorder'] = Struct('com.sun.star.table.TableBorder2')
+        self.properties['TableColumnSeparators'] = ()
+
+    @property
+    def label(self) -> str:
+        return self.name or "TextTable"
+
+    @property
+    def TableName(self) -> str:
+        return self.name
+
+    @TableName.setter
+    def TableName(self, name: str) -> None:
+        self.doc._rename(self.doc._tables, self, self.name, name)
+        self.name = name
+
+    def initialize(self, rows: int, columns: int) -> None:
+        self._record('initialize', rows, columns)
+        self.rows = [[_Cell(self.doc, self, row) for _ in range(columns)] for row in range(rows)]
+        # Writer puts a separator between each pair of columns, in 1/10000 of the table width
+        self.properties['TableColumnSeparators'] = tuple(
+            Struct('com.sun.star.text.TableColumnSeparator', Position=10000 * (i + 1) // columns, IsVisible=True)
+            for i in range(columns - 1)
+        )
+
+    def getName(self) -> str:
+        return self.name
+
+    def setName(self, name: str) -> None:
+        self.TableName = name
+
+    def getRows(self):
+        return self.rows
+
+    def getCellNames(self) -> tuple:
+        return tuple(_cell_name(column, row) for row in range(len(self.rows)) for column in range(len(self.rows[row])))
+
+    def getCellByName(self, cell_name: str) -> _Cell:
+        column, row = _cell_position(cell_name)
+        return self.rows[row][column]
+
+    def getCellByPosition(self, column: int, row: int) -> _Cell:
+        return self.rows[row][column]
+
+    def createCursorByCellName(self, cell_name: str) -> _TableCursor:
+        return _TableCursor(self, cell_name)
+
+    def getDataArray(self) -> tuple:
+        return tuple(tuple(cell.text for cell in row) for row in self.rows)
+
+    def setDataArray(self, data) -> None:
+        self._record('setDataArray', data)
+        for row, values in zip(self.rows, data, strict=True):
+            for cell, value in zip(row, values, strict=True):
+                cell._set_text(str(value))
+
+    def _set_property(self, name, value):
+        # structs are returned by value, as in UNO
+        self.properties[name] = copy.deepcopy(value)
+
+    def __getattr__(self, name):
+        value = super().__getattr__(name)
+        return copy.deepcopy(value) if name in ('TableBorder', 'TableColumnSeparators') else value
+
+    def _containers(self):
+        for row in self.rows:
+            for cell in row:
+                yield from cell._containers()
+
+    def _copy(self, doc):
+        table = _TextTable(doc)
+        table.name = self.name
+        table.properties.update(copy.deepcopy(self.properties))
+        table.rows = [[cell._copy(doc, table) for cell in row] for row in self.rows]
+        return table
+
+
+class _GraphicObject(_FakeObject):
+    """
+    Image anchored in a container of the document.
+    """
+
+    def __init__(self, doc, name: str, anchor: _TextContainer):
+        super().__init__(doc.log)
+        self.doc = doc
+        self.name = name
+        self.anchor = anchor
+
+    @property
+    def label(self) -> str:
+        return self.name
+
+    def getName(self) -> str:
+        return self.name
+
+    def setName(self, name: str) -> None:
+        self._record('setName', name)
+        self.doc._rename(self.doc._graphics, self, self.name, name)
+        self.name = name
+
+    def getAnchor(self):
+        return self.anchor
+
+
+class _Descriptor(_FakeObject):
+    """
+    Search or replace descriptor.
+    """
+
+    def __init__(self, log):
+        super().__init__(log)
+        self.search_string = ''
+        self.replace_string = ''
+
+    def setSearchString(self, search_string: str) -> None:
+        self.search_string = search_string
+
+    def getSearchString(self) -> str:
+        return self.search_string
+
+    def setReplaceString(self, replace_string) -> None:
+        self.replace_string = str(replace_string)
+
+    def getReplaceString(self) -> str:
+        return self.replace_string
+
+    def _pattern(self):
+        flags = 0 if self.properties.get('SearchCaseSensitive') else re.IGNORECASE
+        return re.compile(re.escape(self.search_string), flags)
+
+
+class _ViewCursor(_FakeObject):
+
+    def __init__(self, log):
+        super().__init__(log)
+        self.properties['PageStyleName'] = 'Default Page Style'
+
+    @property
+    def label(self) -> str:
+        return "ViewCursor"
+
+    def gotoEnd(self, expand: bool) -> None:
+        self._record('gotoEnd', expand)
+
+    def goRight(self, count: int, expand: bool) -> bool:
+        self._record('goRight', count, expand)
+        return True
+
+    def goDown(self, count: int, expand: bool) -> bool:
+        self._record('goDown', count, expand)
+        return True
+
+
+class _Transferable:
+    """
+    Copied content: a table with the images anchored in it.
+    """
+
+    def __init__(self, table, graphics):
+        self.table = table
+        self.graphics = graphics
+
+
+class _Controller(_FakeObject):
+
+    def __init__(self, doc):
+        super().__init__(doc.log)
+        self.doc = doc
+        self.selection = None
+        self.view_cursor = _ViewCursor(doc.log)
+        self.properties['Frame'] = _Frame(self)
+
+    @property
+    def label(self) -> str:
+        return "Controller"
+
+    def getViewCursor(self):
+        return self.view_cursor
+
+    def getFrame(self):
+        return self.Frame
+
+    def select(self, selection) -> bool:
+        self._record('select', selection.label)
+        self.selection = selection
+        return True
+
+    def getTransferable(self):
+        table = self.selection
+        containers = set(map(id, table._containers()))
+        graphics = [g for g in self.doc._graphics.values() if id(g.anchor) in containers]
+        return _Transferable(table, graphics)
+
+    def insertTransferable(self, transferable) -> None:
+        self._record('insertTransferable', transferable.table.label)
+        source = transferable.table
+        table = source._copy(self.doc)
+
+        # anchor the images in the copied containers at the same position
+        copies = dict(zip(map(id, source._containers()), table._containers()))
+        self.doc.Text._insert_table(table)
+        for graphic in transferable.graphics:
+            graphic_copy = _GraphicObject(self.doc, graphic.name, copies[id(graphic.anchor)])
+            graphic_copy.properties.update(graphic.properties)
+            self.doc._register(self.doc._graphics, graphic_copy, "Image")
+
+
+class _Frame:
+
+    def __init__(self, controller):
+        self.Controller = controller
+
+    def getController(self):
+        return self.Controller
+
+
+class _Style(_FakeObject):
+
+    def __init__(self, log, name: str):
+        super().__init__(log)
+        self.name = name
+
+    @property
+    def label(self) -> str:
+        return self.name
+
+
+class _StyleFamilies(_NameAccess):
+    """
+    Style families, with the styles created when they are first used.
+    """
+
+    def __init__(self, log):
+        super().__init__({})
+        self.log = log
+
+    def getByName(self, name: str):
+        if name not in self._items:
+            self._items[name] = _StyleFamily(self.log, name)
+        return self._items[name]
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return self.getByName(name)
+
+
+class _StyleFamily(_StyleFamilies):
+
+    def __init__(self, log, name: str):
+        super().__init__(log)
+        self.name = name
+
+    def getByName(self, name: str):
+        if name not in self._items:
+            self._items[name] = _Style(self.log, f"{self.name}.{name}")
+        return self._items[name]
+
+
+class FakeDocument(_FakeObject):
+    """
+    Writer document model.
+
+    Args:
+        log (list): Operation log shared by the objects of the backend.
+    """
+
+    def __init__(self, log: list):
+        super().__init__(log)
+        self._tables = {}
+        self._graphics = {}
+        self._edits = []  # Containers in the order their text was set, to only search the changed ones
+        self._clean = {}  # Per search string, position in _edits up to which no container contains it
+        self.closed = False
+        self.stored = []  # (URL, filter name)
+        self.properties['Text'] = _Text(self)
+        self.properties.update(TextTables=_NameAccess(self._tables), GraphicObjects=_NameAccess(self._graphics),
+                               StyleFamilies=_StyleFamilies(log), CurrentController=_Controller(self))
+
+    @property
+    def label(self) -> str:
+        return "Document"
+
+    def getText(self):
+        return self.Text
+
+    def getTextTables(self):
+        return self.TextTables
+
+    def getGraphicObjects(self):
+        return self.GraphicObjects
+
+    def getCurrentController(self):
+        return self.CurrentController
+
+    def createInstance(self, service_name: str):
+        if service_name != "com.sun.star.text.TextTable":
+            raise NotImplementedError(f"{service_name} is not available in the memory backend")
+        return _TextTable(self)
+
+    def createSearchDescriptor(self):
+        return _Descriptor(self.log)
+
+    def createReplaceDescriptor(self):
+        return _Descriptor(self.log)
+
+    def findNext(self, start, descriptor):
+        """
+        Finds the next match after the start range, in document order.
+        """
+        pattern = descriptor._pattern()
+        container = start.getText()
+
+        # only look from the top level block of the start range, it is usually at the end of the document
+        blocks = self.Text.blocks
+        containers = None
+        for block_idx in range(len(blocks) - 1, -1, -1):
+            block_containers = list(blocks[block_idx]._containers())
+            if any(c is container for c in block_containers):
+                containers = block_containers + [c for b in blocks[block_idx + 1:] for c in b._containers()]
+                break
+        if containers is None:
+            return None
+
+        offset = start.end
+        for c in containers[next(i for i, c in enumerate(containers) if c is container):]:
+            match = pattern.search(c.text, offset if c is container else 0)
+            if match:
+                self._record('findNext', descriptor.search_string)
+                return _TextRange(c, match.start(), match.end())
+        return None
+
+    def replaceAll(self, descriptor) -> int:
+        self._record('replaceAll', descriptor.search_string, descriptor.replace_string)
+        pattern = descriptor._pattern()
+        key = (pattern.pattern, pattern.flags)
+
+        # containers not edited since the last replaceAll of the same string cannot contain it
+        changed = {id(c): c for c in self._edits[self._clean.get(key, 0):]}
+        count = sum(c._replace(pattern, descriptor.replace_string) for c in changed.values())
+        self._clean[key] = len(self._edits)
+        return count
+
+    def storeToURL(self, url: str, properties) -> None:
+        self._record('storeToURL', url)
+        filter_names = [p.Value for p in properties if getattr(p, 'Name', None) == 'FilterName']
+        self.stored.append((url, filter_names[0] if filter_names else None))
+
+    def close(self, deliver_ownership: bool) -> None:
+        self._record('close')
+        self.closed = True
+
+    def hyperlinks(self) -> list[tuple[str, str, str]]:
+        """
+        Returns:
+            list[tuple[str, str, str]]: (location, linked text, URL) of the text hyperlinks of the document, in
+                document order. Images with a hyperlink are listed at the end with their name as location.
+        """
+        links = [(c.label, text, url) for c in self.Text._containers() for text, url in c.hyperlinks()]
+        links += [(g.name, '', g.properties['HyperLinkURL']) for g in self._graphics.values()
+                  if 'HyperLinkURL' in g.properties]
+        return links
+
+    def add_graphic(self, name: str, anchor: _TextContainer) -> _GraphicObject:
+        """
+        Adds an image anchored in the given paragraph or cell (e.g. to build a template).
+        """
+        graphic = _GraphicObject(self, name, anchor)
+        self._register(self._graphics, graphic, "Image")
+        return graphic
+
+    def add_table(self, rows: int, columns: int, name: str, container: _TextContainer = None) -> _TextTable:
+        """
+        Adds a table at the end of the document, or nested in the given cell (e.g. to build a template).
+        """
+        table = _TextTable(self)
+        table.initialize(rows, columns)
+        if container is None:
+            self.Text._insert_table(table)
+        else:
+            self._register_table(table)
+            container.tables.append(table)
+        table.TableName = name
+        return table
+
+    def _edited(self, container) -> None:
+        self._edits.append(container)
+
+    def _register_table(self, table) -> None:
+        self._register(self._tables, table, "Table")
+        for container in table._containers():
+            for nested in container.tables:
+                self._register(self._tables, nested, "Table")
+
+    def _register(self, items: dict, obj, prefix: str) -> None:
+        # like Writer, objects without a name or whose name is already taken get a new one
+        if not obj.name or obj.name in items:
+            obj.name = next(name for name in (f"{prefix}{i}" for i in itertools.count(len(items) + 1))
+                            if name not in items)
+        items[obj.name] = obj
+
+    def _rename(self, items: dict, obj, old_name: str, new_name: str) -> None:
+        # objects not inserted in the document yet are registered with their name when inserted
+        if items.get(old_name) is not obj or old_name == new_name:
+            return
+        if new_name in items:
+            raise ValueError(f"the name '{new_name}' is already used")
+        del items[old_name]
+        items[new_name] = obj
+
+
+class _Desktop:
+
+    def __init__(self, backend):
+        self.backend = backend
+
+    def getCurrentComponent(self):
+        return self.backend.document
+
+    def loadComponentFromURL(self, url: str, target: str, flags: int, args):
+        self.backend.operations.append(Operation("Desktop", 'loadComponentFromURL', (url,)))
+        if url == "private:factory/swriter":
+            return FakeDocument(self.backend.operations)
+        return self.backend.load_template(url)
+
+
+class _DispatchHelper(_FakeObject):
+
+    @property
+    def label(self) -> str:
+        return "DispatchHelper"
+
+    def executeDispatch(self, frame, url: str, target: str, flags: int, args) -> None:
+        self._record('executeDispatch', url)
+
+
+class _ServiceManager:
+
+    def __init__(self, log):
+        self.log = log
+
+    def createInstanceWithContext(self, service_name: str, ctx):
+        if service_name != "com.sun.star.frame.DispatchHelper":
+            raise NotImplementedError(f"{service_name} is not available in the memory backend")
+        return _DispatchHelper(self.log)
+
+    def createInstance(self, service_name: str):
+        raise NotImplementedError(f"{service_name} is not available in the memory backend (no dialogs, give the "
+                                  f"year and template to the generators)")
+
+
+def build_template(doc: FakeDocument, template_path: str) -> None:
+    """
+    Fills the document with the tables of the daily template file (cells, their text, nested tables and images),
+    as read by AgendaCore.read_template_tables.
+
+    Args:
+        doc (FakeDocument): An empty document.
+        template_path (str): Full path to the daily template file.
+    """
+    for template_table in read_template_tables(template_path):
+        _add_template_table(doc, template_table)
+
+
+def _add_template_table(doc: FakeDocument, template_table, container: _TextContainer = None) -> None:
+    rows = template_table.rows
+    table = doc.add_table(len(rows), max(map(len, rows)), template_table.name, container)
+    for cells, template_cells in zip(table.rows, rows):
+        # rows with merged cells have fewer cells
+        del cells[len(template_cells):]
+        for cell, template_cell in zip(cells, template_cells):
+            cell._set_text(template_cell.text)
+            for nested in template_cell.tables:
+                _add_template_table(doc, nested, cell)
+            for image in template_cell.images:
+                doc.add_graphic(image, cell)
+
+
+class MemoryBackend(DocumentBackend):
+    """
+    Backend keeping the documents in memory.
+
+    Args:
+        template_factory (callable, optional): Function filling an empty FakeDocument with the daily template.
+            Called with the document and the template path. If None, build_template reads the template file.
+    """
+
+    def __init__(self, template_factory=None):
+        self.operations = []  # Operations performed on all the documents, in order
+        self.document = FakeDocument(self.operations)  # Document the generators write into
+        self.template_factory = template_factory or build_template
+        self.desktop = _Desktop(self)
+        self.smgr = _ServiceManager(self.operations)
+
+    def get_context(self):
+        return None, self.desktop, self.smgr, self.document
+
+    def new_document(self):
+        self.document = FakeDocument(self.operations)
+        return self.document
+
+    def export_document(self, path: str, filter_name: str = "writer8") -> None:
+        """
+        Records the export in the operations and in `document.stored`, without writing any file.
+        """
+        filter_prop = Struct("com.sun.star.beans.PropertyValue", Name="FilterName", Value=filter_name)
+        self.document.storeToURL(pathlib.Path(path).as_uri(), (filter_prop,))
+
+    def load_template(self, template_path: str):
+        self.operations.append(Operation("Backend", 'load_template', (template_path,)))
+        template_doc = FakeDocument(self.operations)
+        self.template_factory(template_doc, template_path)
+        return template_doc
+
+    def preload_template(self, template_path: str) -> None:
+        # Templates are built in memory on every load, there is nothing to keep
+        self.operations.append(Operation("Backend", 'preload_template', (template_path,)))
+
+    def close_template(self, template_doc) -> None:
+        template_doc.close(True)
+
+    def create_struct(self, type_name: str):
+        return Struct(type_name)
+
+    def enum(self, type_name: str, value: str):
+        return Enum(type_name, value)
+
+    def invoke(self, obj, method_name: str, args: tuple):
+        return getattr(obj, method_name)(*args)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Profile the agenda generators on the in-memory backend.")
+    parser.add_argument('year', type=int, help="year of the agenda")
+    args = parser.parse_args()
+
+    import AgendaGenerator as agenda
+    from AgendaBackend import set_backend
+
+    backend = MemoryBackend()
+    set_backend(backend)
+    steps = [
+        ('configure_page_for_rmk', agenda.configure_page_for_rmk, ()),
+        ('generate_title_page', agenda.generate_title_page, (args.year,)),
+        ('generate_calendar', agenda.generate_calendar, (args.year,)),
+        ('generate_monthly_agenda', agenda.generate_monthly_agenda, (args.year,)),
+        ('generate_daily_agenda', agenda.generate_daily_agenda, (args.year, None, DEFAULT_TEMPLATE)),
+    ]
+    for name, function, function_args in steps:
+        operations = len(backend.operations)
+        start = time.perf_counter()
+        function(*function_args)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<25} {elapsed * 1000:9.1f} ms {len(backend.operations) - operations:8} operations")
+    print(f"{len(backend.document.TextTables.getElementNames())} tables, "
+          f"{len(backend.document.hyperlinks())} hyperlinks")
+
+
+if __name__ == '__main__':
+    main()
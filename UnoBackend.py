@@ -0,0 +1,170 @@
+"""
+Document backend writing into a live LibreOffice through PyUNO.
+"""
+import os
+
+import uno
+
+from com.sun.star.beans import PropertyValue
+from com.sun.star.lang import DisposedException
+
+from AgendaBackend import DocumentBackend
+
+
+# UNO connection string used to reach a running office when not executed as a macro
+OFFICE_CONNECTION = "uno:socket,host=localhost,port=2002;urp;StarOffice.ComponentContext"
+
+
+class UnoBackend(DocumentBackend):
+    """
+    Backend using a live LibreOffice.
+
+    Uses the XSCRIPTCONTEXT if given (when running as a macro inside LibreOffice). Otherwise, connects to a running
+    LibreOffice instance via socket the first time it is needed, and keeps the connection for later calls.
+
+    Args:
+        connection (str, optional): UNO connection string. If None, OFFICE_CONNECTION is used.
+        script_context (optional): XSCRIPTCONTEXT when running as a macro inside LibreOffice.
+    """
+
+    def __init__(self, connection: str = None, script_context=None):
+        self.connection = connection or OFFICE_CONNECTION
+        self.script_context = script_context
+        self.document = None  # Writer document the generators write into, instead of the current component
+        self._office = None  # (ctx, desktop, smgr) of the socket connection
+        self._templates = {}  # Preloaded template documents, kept open between calls: path -> (mtime, document)
+
+    def connect(self):
+        """
+        Connects to the running LibreOffice instance via socket, replacing any previous connection.
+
+        Returns:
+            tuple: (ctx, desktop, smgr)
+                ctx: The UNO component context.
+                desktop: The central desktop object.
+                smgr: The UNO service manager.
+        """
+        # get the uno component context from the PyUNO runtime
+        local_context = uno.getComponentContext()
+
+        # create the UnoUrlResolver
+        resolver = local_context.ServiceManager.createInstanceWithContext("com.sun.star.bridge.UnoUrlResolver",
+                                                                         local_context)
+
+        # connect to the running office
+        ctx = resolver.resolve(self.connection)
+        smgr = ctx.ServiceManager
+
+        # get the central desktop object
+        desktop = smgr.createInstanceWithContext("com.sun.star.frame.Desktop", ctx)
+
+        # templates loaded through a previous connection are no longer reachable
+        self._templates.clear()
+        self._office = (ctx, desktop, smgr)
+        return self._office
+
+    def get_office(self):
+        """
+        Returns:
+            tuple: (ctx, desktop, smgr)
+        """
+        if self.script_context is not None:
+            desktop = self.script_context.getDesktop()
+            ctx = self.script_context.getComponentContext()
+            smgr = ctx.getServiceManager()
+            return ctx, desktop, smgr
+
+        return self._office or self.connect()
+
+    def get_context(self):
+        ctx, desktop, smgr = self.get_office()
+
+        # Check whether there's already an opened document.
+        # Otherwise, create a new one
+        model = self.document
+        if model is None:
+            model = desktop.getCurrentComponent()
+            if not hasattr(model, "Text"):
+                model = desktop.loadComponentFromURL("private:factory/swriter", "_blank", 0, ())
+
+        return ctx, desktop, smgr, model
+
+    def new_document(self):
+        """
+        Opens a new Writer document and makes the generators write into it.
+
+        Returns:
+            The Writer document model.
+        """
+        ctx, desktop, smgr = self.get_office()
+        self.document = desktop.loadComponentFromURL("private:factory/swriter", "_blank", 0, ())
+        return self.document
+
+    def load_template(self, template_path: str):
+        """
+        Returns the template document for the given path, reusing it if it was preloaded. A preloaded template is
+        loaded again if the file changed since.
+        """
+        if template_path not in self._templates:
+            return self._load_document(template_path)
+
+        mtime = os.path.getmtime(template_path)
+        loaded_mtime, template_doc = self._templates[template_path]
+        try:
+            if loaded_mtime == mtime:
+                template_doc.getTextTables()
+                return template_doc
+            # the file was edited since it was loaded
+            template_doc.close(True)
+        except DisposedException:
+            # the document was closed from the outside
+            pass
+
+        template_doc = self._load_document(template_path)
+        self._templates[template_path] = (mtime, template_doc)
+        return template_doc
+
+    def preload_template(self, template_path: str) -> None:
+        """
+        Loads the daily template and keeps it open, so that later generate_daily_agenda calls with the same path
+        do not have to load it again.
+
+        Args:
+            template_path (str): Full path to the daily template file.
+        """
+        if template_path not in self._templates:
+            mtime = os.path.getmtime(template_path)
+            self._templates[template_path] = (mtime, self._load_document(template_path))
+
+    def close_template(self, template_doc) -> None:
+        # Preloaded templates stay open for the next call
+        if all(template_doc is not preloaded_doc for mtime, preloaded_doc in self._templates.values()):
+            template_doc.close(True)
+
+    def _load_document(self, path: str):
+        ctx, desktop, smgr = self.get_office()
+        return desktop.loadComponentFromURL(uno.systemPathToFileUrl(path), "_blank", 0, ())
+
+    def export_document(self, path: str, filter_name: str = "writer8") -> None:
+        """
+        Stores the Writer document the generators write into at the given path.
+
+        Args:
+            path (str): Full path of the output file.
+            filter_name (str, optional): LibreOffice export filter (e.g., 'writer8' or 'writer_pdf_Export').
+        """
+        ctx, desktop, smgr, model = self.get_context()
+
+        filter_prop = PropertyValue()
+        filter_prop.Name = "FilterName"
+        filter_prop.Value = filter_name
+        model.storeToURL(uno.systemPathToFileUrl(path), (filter_prop,))
+
+    def create_struct(self, type_name: str):
+        return uno.createUnoStruct(type_name)
+
+    def enum(self, type_name: str, value: str):
+        return uno.Enum(type_name, value)
+
+    def invoke(self, obj, method_name: str, args: tuple):
+        return uno.invoke(obj, method_name, args)
@@ -1,16 +1,130 @@
-from AgendaGenerator import generate_calendar, generate_monthly_agenda, generate_all, generate_daily_agenda, configure_page_for_rmk, generate_title_page
+"""
+Command line interface of the agenda generator.
+
+    python main.py render 2025 --template template_rmk.odt --output agenda.pdf
+    python main.py render 2025 --template template_rmk.odt --dry-run
+    python main.py render 2025 --backend memory
+    python main.py check template_rmk.odt
+
+Only `render` loads the generators, and PyUNO is only imported when it renders with the office backend, which needs
+LibreOffice's Python and a running LibreOffice. For debugging, launch LibreOffice with:
+    "D:\\Program Files\\LibreOffice\\program\\soffice.exe" --writer --accept="socket,host=localhost,port=2002;urp;"
+first, then debug the program as normal (running the program from Pycharm)
+
+Calendar icon https://www.flaticon.com/free-icon/calendar_55281?term=calendar&page=1&position=6&origin=tag&related_id=55281
+"""
+import argparse
+import os
+import sys
+import time
+
+from AgendaCore import DEFAULT_TEMPLATE, OUTPUT_FORMATS, PAGE_PROFILES, check_template, daily_date_range
+
+
+def _render(args) -> int:
+    first_day, last_day = daily_date_range(args.year, args.months)
+    template = os.path.abspath(args.template) if args.template else None
+    if args.backend == 'memory' and not template:
+        template = DEFAULT_TEMPLATE
+
+    if not template:
+        print("A --template is needed to render with the office backend", file=sys.stderr)
+        return 2
+    # Only the errors stop the rendering, the generator skips what the warnings report
+    errors, warnings = check_template(template)
+    _print_problems(template, errors, warnings, sys.stderr)
+    if errors:
+        return 1
+
+    if args.dry_run:
+        print(f"Agenda {args.year} ({args.profile} page profile): title page, yearly calendar, 12 monthly tables and "
+              f"{(last_day - first_day).days} daily pages from {first_day:%Y-%m-%d} to {last_day:%Y-%m-%d} "
+              f"(not included), with the template {template}")
+        return 0
+
+    # The generators (and the backends) are only loaded when there is something to render
+    import AgendaGenerator
+    from AgendaBackend import set_backend
+
+    if args.backend == 'memory':
+        from MemoryBackend import MemoryBackend
+        backend = MemoryBackend()
+    else:
+        try:
+            from UnoBackend import UnoBackend
+        except ImportError:
+            print("The office backend needs PyUNO: run main.py with the Python shipped with LibreOffice, or use "
+                  "--backend memory or --dry-run", file=sys.stderr)
+            return 2
+        backend = UnoBackend()
+    set_backend(backend)
+
+    start = time.perf_counter()
+    if args.backend == 'office':
+        backend.new_document()
+    AgendaGenerator.generate_agenda(args.year, template, months=args.months, profile=args.profile)
+
+    if args.backend == 'memory':
+        print(f"Generated in {(time.perf_counter() - start) * 1000:.1f} ms: "
+              f"{backend.document.TextTables.getCount()} tables, {len(backend.document.hyperlinks())} hyperlinks, "
+              f"{len(backend.operations)} operations")
+    elif args.output:
+        backend.export_document(os.path.abspath(args.output), OUTPUT_FORMATS[_output_format(args.output)][0])
+    return 0
+
+
+def _output_format(path: str) -> str:
+    return os.path.splitext(path)[1].lstrip('.').lower()
+
+
+def _check(args) -> int:
+    errors, warnings = check_template(args.template)
+    _print_problems(args.template, errors, warnings, sys.stdout)
+    if not errors and not warnings:
+        print(f"{args.template}: OK")
+    return 1 if errors else 0
+
+
+def _print_problems(template: str, errors: list[str], warnings: list[str], file) -> None:
+    for error in errors:
+        print(f"{template}: error: {error}", file=file)
+    for warning in warnings:
+        print(f"{template}: warning: {warning}", file=file)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Generate a hyperlinked agenda with LibreOffice.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    render = commands.add_parser('render', help="generate an agenda")
+    render.add_argument('year', type=int, help="year of the agenda")
+    render.add_argument('--template', help="daily template (.odt)")
+    render.add_argument('--months', type=int, nargs=2, metavar=('FIRST', 'LAST'),
+                        help="first and last month of the daily pages (default: the whole year)")
+    render.add_argument('--profile', choices=PAGE_PROFILES, default='rmk', help="page profile (default: %(default)s)")
+    render.add_argument('--backend', choices=('office', 'memory'), default='office',
+                        help="render into a running LibreOffice, or in memory to time the generators "
+                             "(default: %(default)s)")
+    render.add_argument('--output', help="file to export the agenda to (.odt or .pdf); by default it is left open "
+                                         "in LibreOffice")
+    render.add_argument('--dry-run', action='store_true', help="check the template and show what would be generated")
+    render.set_defaults(function=_render)
+
+    check = commands.add_parser('check', help="check that a daily template can be used")
+    check.add_argument('template', help="daily template (.odt)")
+    check.set_defaults(function=_check)
+
+    args = parser.parse_args()
+    if args.command == 'render' and args.months and not 1 <= args.months[0] <= args.months[1] <= 12:
+        parser.error("--months must be two months between 1 and 12, the first one not after the last one")
+    if args.command == 'render' and args.output:
+        # checked before rendering, which takes minutes with the office backend
+        if args.backend == 'memory':
+            parser.error("--output cannot be used with the memory backend, which does not write files")
+        if _output_format(args.output) not in OUTPUT_FORMATS:
+            parser.error(f"--output must be a {' or '.join(f'.{ext}' for ext in OUTPUT_FORMATS)} file")
+    return args.function(args)
+
 
 if __name__ == '__main__':
-    # For debugging, launch libroffice with:
-    # "D:\Program Files\LibreOffice\program\soffice.exe" --calc --accept="socket,host=localhost,port=2002;urp;"
-    # "D:\Program Files\LibreOffice\program\soffice.exe" --writer --accept="socket,host=localhost,port=2002;urp;"
-    # first, then debug the program as normal (running the program from Pycharm)
-
-    # Calendar icon https://www.flaticon.com/free-icon/calendar_55281?term=calendar&page=1&position=6&origin=tag&related_id=55281
-
-    # GenerateAll()
-    # ConfigurePageForRMK()
-    # GenerateTitlePage(2025)
-    # GenerateCalendar(2025)
-    # GenerateMonthlyAgenda(2025)
-    generate_daily_agenda(year=2025, test=True)
\ No newline at end of file
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+Checks the UNO-free core: that it and the command line load without PyUNO, the template analysis and the date and
+layout computations.
+"""
+import datetime
+import importlib.util
+import os
+import subprocess
+import sys
+import zipfile
+
+import pytest
+
+from AgendaCore import (
+    DEFAULT_TEMPLATE, analyze_template, check_template, daily_date_range, read_template_tables, yearly_calendar_layout,
+)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def _template_variant(path, *replacements) -> str:
+    """
+    Writes a copy of the included template with the given (old, new) replacements in its content.xml.
+    """
+    with zipfile.ZipFile(DEFAULT_TEMPLATE) as source, zipfile.ZipFile(path, 'w') as target:
+        for item in source.infolist():
+            data = source.read(item.filename)
+            if item.filename == 'content.xml':
+                for old, new in replacements:
+                    assert old in data
+                    data = data.replace(old, new)
+            target.writestr(item, data)
+    return str(path)
+
+
+def test_core_modules_do_not_import_uno():
+    code = ("import sys, main, AgendaCore, AgendaGenerator, AgendaBackend; "
+            "print(sorted(m for m in sys.modules if m == 'uno' or m == 'com' or m.startswith('com.')))")
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT, capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '[]'
+
+
+@pytest.mark.skipif(importlib.util.find_spec('uno') is not None, reason="PyUNO is available")
+def test_render_without_pyuno():
+    result = subprocess.run([sys.executable, 'main.py', 'render', '2025', '--template', DEFAULT_TEMPLATE], cwd=ROOT,
+                            capture_output=True, text=True)
+    assert result.returncode == 2
+    assert "needs PyUNO" in result.stderr and "Traceback" not in result.stderr
+
+
+def test_analyze_included_template():
+    info = analyze_template(DEFAULT_TEMPLATE)
+    assert info.tables == ['DayTable', 'Table2', 'Table18', 'CalendarTable']
+    assert info.images == ['CalendarIcon']
+    assert info.placeholders == ['<d', '<MONTH>', '<WEEKDAY>', '<WEEKNUMBER>']
+    assert info.month_abbreviations == ['JAN', 'FEB', 'MAR', 'APR', 'MAY', 'JUN',
+                                        'JUL', 'AUG', 'SEP', 'OCT', 'NOV', 'DEC']
+
+
+def test_check_included_template():
+    assert check_template(DEFAULT_TEMPLATE) == ([], [])
+
+
+def test_check_template_without_day_table(tmp_path):
+    template = _template_variant(tmp_path / 'template.odt', (b'table:name="DayTable"', b'table:name="Days"'))
+    assert check_template(template) == (["There is no table named 'DayTable'"], [])
+
+
+def test_check_template_without_calendar_icon(tmp_path):
+    template = _template_variant(tmp_path / 'template.odt', (b'draw:name="CalendarIcon"', b'draw:name="Icon"'))
+    assert check_template(template) == (["There is no image named 'CalendarIcon' in 'DayTable'"], [])
+
+
+def test_missing_month_is_a_warning(tmp_path):
+    template = _template_variant(tmp_path / 'template.odt', (b'>JAN<', b'><'))
+    assert check_template(template) == ([], ["The month 'JAN' is missing from 'DayTable'"])
+
+
+def test_check_template_not_a_zip(tmp_path):
+    template = tmp_path / 'template.odt'
+    template.write_text("not a document")
+    assert check_template(str(template)) == (["The template is not an OpenDocument text (.odt) file"], [])
+
+
+def test_check_missing_template(tmp_path):
+    errors, warnings = check_template(str(tmp_path / 'missing.odt'))
+    assert len(errors) == 1 and errors[0].startswith("Cannot read the template")
+
+
+def test_read_template_tables():
+    day_table, = read_template_tables(DEFAULT_TEMPLATE)
+    assert day_table.name == 'DayTable'
+    # merged cells leave 4 cells in the first row, 3 in the second and 1 in the others
+    assert [len(row) for row in day_table.rows] == [4, 3] + [1] * 12
+    assert day_table.rows[0][0].images == ['CalendarIcon']
+    assert [cell.text for cell in day_table.rows[0][1:]] == ['<d', '<MONTH>\n<WEEKDAY>', 'WEEK <WEEKNUMBER>']
+    assert [table.name for table in day_table.rows[1][2].tables] == ['Table18', 'CalendarTable']
+
+
+def test_daily_date_range():
+    assert daily_date_range(2025, None) == (datetime.datetime(2025, 1, 1), datetime.datetime(2026, 1, 1))
+    assert daily_date_range(2025, (12, 12)) == (datetime.datetime(2025, 12, 1), datetime.datetime(2026, 1, 1))
+    assert daily_date_range(2025, (2, 3)) == (datetime.datetime(2025, 2, 1), datetime.datetime(2025, 4, 1))
+
+
+def test_yearly_calendar_layout():
+    layout = yearly_calendar_layout(2024)
+    assert layout.month_rows == [(0, ['January', 'February', 'March']), (9, ['April', 'May', 'June']),
+                                 (18, ['July', 'August', 'September']),
+                                 (27, ['October', 'November', 'December'])]
+    days = [cell for cell in layout.cells if cell[3]]
+    assert len(days) == 366
+    # 2024 starts on a Monday, in the first column of the first week row
+    assert days[0] == (0, 2, '1', '#DayTable1|table')
+    assert layout.cells[:7] == [(column, 1, header, None) for column, header in enumerate('MTWTFSS')]
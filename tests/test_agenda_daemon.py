@@ -0,0 +1,136 @@
+"""
+Checks the queueing and the request validation of the render daemon, with stub workers instead of office instances.
+"""
+import threading
+import time
+from http import HTTPStatus
+
+import pytest
+
+import AgendaDaemon
+from AgendaCore import DEFAULT_TEMPLATE
+
+
+class _StubWorker:
+    """
+    Worker rendering a job once `release` is set.
+    """
+
+    def __init__(self, index: int, soffice_path: str, templates: list[str]):
+        self.index = index
+        self.release = threading.Event()
+        self.started = threading.Event()
+
+    def render(self, job: dict) -> tuple[int, bytes]:
+        self.started.set()
+        self.release.wait(5)
+        return HTTPStatus.OK, b'agenda'
+
+    def stop(self) -> None:
+        self.release.set()
+
+
+@pytest.fixture
+def make_pool(monkeypatch):
+    monkeypatch.setattr(AgendaDaemon, '_Worker', _StubWorker)
+    pools = []
+
+    def make(workers: int, max_queued: int) -> AgendaDaemon.RenderPool:
+        pool = AgendaDaemon.RenderPool(workers, max_queued)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.close()
+
+
+def _render_in_background(pool: AgendaDaemon.RenderPool) -> tuple[threading.Thread, list]:
+    results = []
+    thread = threading.Thread(target=lambda: results.append(pool.render({})))
+    thread.start()
+    return thread, results
+
+
+def _wait_for(condition) -> None:
+    deadline = time.monotonic() + 5
+    while not condition():
+        assert time.monotonic() < deadline
+        time.sleep(0.01)
+
+
+def test_idle_worker_is_not_queued(make_pool):
+    pool = make_pool(workers=1, max_queued=0)
+    pool._workers[0].release.set()
+    assert pool.render({}) == (HTTPStatus.OK, b'agenda')
+    assert pool.status()['queued'] == 0
+
+
+def test_no_queue_only_rejects_when_all_workers_are_busy(make_pool):
+    pool = make_pool(workers=2, max_queued=0)
+    first, first_results = _render_in_background(pool)
+    pool._workers[0].started.wait(5)
+
+    # the second worker is still idle
+    pool._workers[1].release.set()
+    assert pool.render({}) == (HTTPStatus.OK, b'agenda')
+
+    pool._workers[1].release.clear()
+    second, second_results = _render_in_background(pool)
+    _wait_for(lambda: pool.status()['busy'] == 2)
+    assert pool.render({}) == (HTTPStatus.SERVICE_UNAVAILABLE, b"Too many queued jobs")
+
+    for worker in pool._workers:
+        worker.release.set()
+    first.join()
+    second.join()
+    assert first_results == second_results == [(HTTPStatus.OK, b'agenda')]
+
+
+def test_queue_limit(make_pool):
+    pool = make_pool(workers=1, max_queued=1)
+    busy, busy_results = _render_in_background(pool)
+    _wait_for(lambda: pool.status()['busy'] == 1)
+    queued, queued_results = _render_in_background(pool)
+    _wait_for(lambda: pool.status()['queued'] == 1)
+
+    assert pool.render({}) == (HTTPStatus.SERVICE_UNAVAILABLE, b"Too many queued jobs")
+
+    pool._workers[0].release.set()
+    busy.join()
+    queued.join()
+    assert busy_results == queued_results == [(HTTPStatus.OK, b'agenda')]
+    assert pool.status()['queued'] == 0
+
+
+def test_parse_job_defaults():
+    assert AgendaDaemon._parse_job({'year': 2025}, [DEFAULT_TEMPLATE]) == {
+        'year': 2025, 'months': None, 'template': DEFAULT_TEMPLATE, 'profile': 'rmk', 'format': 'odt'}
+    assert AgendaDaemon._parse_job({'year': 2025, 'months': [3, 5], 'profile': 'a4', 'format': 'pdf'},
+                                   [DEFAULT_TEMPLATE])['months'] == (3, 5)
+
+
+@pytest.mark.parametrize('payload', [
+    {},
+    {'year': '2025'},
+    {'year': True},
+    {'year': 0},
+    {'year': 2025, 'months': [5, 3]},
+    {'year': 2025, 'months': [0, 3]},
+    {'year': 2025, 'months': [1, True]},
+    {'year': 2025, 'months': 3},
+    {'year': 2025, 'profile': 'letter'},
+    {'year': 2025, 'profile': ['a4']},
+    {'year': 2025, 'format': 'docx'},
+    {'year': 2025, 'format': {}},
+    {'year': 2025, 'template': 5},
+    {'year': 2025, 'template': '/no/such/template.odt'},
+])
+def test_parse_job_rejects(payload):
+    with pytest.raises(ValueError):
+        AgendaDaemon._parse_job(payload, [DEFAULT_TEMPLATE])
+
+
+def test_parse_job_needs_a_template():
+    with pytest.raises(ValueError):
+        AgendaDaemon._parse_job({'year': 2025}, [])
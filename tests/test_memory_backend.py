@@ -0,0 +1,106 @@
+"""
+Runs the generators on the in-memory backend and checks the structure of the agenda they build.
+"""
+import calendar
+import re
+
+import pytest
+
+import AgendaGenerator
+from AgendaBackend import set_backend
+from AgendaCore import DEFAULT_TEMPLATE
+from MemoryBackend import MemoryBackend
+
+
+def _render(year: int, months: tuple[int, int] = None) -> MemoryBackend:
+    backend = MemoryBackend()
+    set_backend(backend)
+    try:
+        backend.new_document()
+        AgendaGenerator.generate_agenda(year, DEFAULT_TEMPLATE, months=months)
+    finally:
+        set_backend(None)
+    return backend
+
+
+@pytest.fixture(scope='module')
+def agenda_2024():
+    return _render(2024)
+
+
+def _links(backend: MemoryBackend, location_prefix: str) -> list[tuple[str, str, str]]:
+    return [link for link in backend.document.hyperlinks() if link[0].startswith(location_prefix)]
+
+
+def test_one_day_table_per_day(agenda_2024):
+    names = agenda_2024.document.TextTables.getElementNames()
+    assert [name for name in names if name.startswith('DayTable')] == [f'DayTable{day}' for day in range(1, 367)]
+    assert names[:13] == ('YearlyCalendarTable',) + tuple(f'MontlyAgenda{month}Table'
+                                                          for month in calendar.month_name[1:])
+
+
+def test_day_placeholders_are_replaced(agenda_2024):
+    day_table = agenda_2024.document.TextTables.getByName('DayTable60')
+    assert [cell.getString() for cell in day_table.getRows()[0]] == ['', '29', 'February\nThursday', 'WEEK 9']
+
+
+def test_day_links_to_monthly_tables(agenda_2024):
+    assert _links(agenda_2024, 'DayTable60.') == [
+        (f'DayTable60.A{month_num + 1}', calendar.month_abbr[month_num].upper(), f'#MontlyAgenda{month}Table|table')
+        for month_num, month in enumerate(calendar.month_name[1:], 1)
+    ]
+
+
+def test_calendar_icons_link_to_yearly_calendar(agenda_2024):
+    assert _links(agenda_2024, 'DailyCalendarIcon') == [
+        (f'DailyCalendarIcon{day}', '', '#YearlyCalendarTable|table') for day in range(1, 367)
+    ]
+
+
+def test_yearly_calendar_links_every_day(agenda_2024):
+    links = _links(agenda_2024, 'YearlyCalendarTable.')
+    assert links[:3] == [('YearlyCalendarTable.A3', '1', '#DayTable1|table'),
+                         ('YearlyCalendarTable.B3', '2', '#DayTable2|table'),
+                         ('YearlyCalendarTable.C3', '3', '#DayTable3|table')]
+    assert sorted(url for location, text, url in links) == sorted(f'#DayTable{day}|table' for day in range(1, 367))
+
+
+def test_monthly_tables_link_their_days(agenda_2024):
+    assert _links(agenda_2024, 'MontlyAgendaFebruaryTable.') == [
+        (f'MontlyAgendaFebruaryTable.A{day}', str(day), f'#DayTable{31 + day}|table') for day in range(1, 30)
+    ]
+
+
+def test_daily_calendar_table(agenda_2024):
+    calendar_table = agenda_2024.document.TextTables.getByName('DailyCalendarTable60')
+    assert calendar_table.getDataArray()[5] == ('26', '27', '28', '29', '', '', '')
+    assert _links(agenda_2024, 'DailyCalendarTable60.')[-1] == ('DailyCalendarTable60.D6', '29', '#DayTable60|table')
+
+
+def test_yearly_calendar_is_filled_row_by_row():
+    backend = MemoryBackend()
+    set_backend(backend)
+    try:
+        AgendaGenerator.generate_calendar(2024)
+    finally:
+        set_backend(None)
+
+    # each row is merged and filled before the next one, as the generator did before the layout moved to AgendaCore
+    rows = [int(re.match(r'Table1\.[A-Z]+(\d+)', operation.target).group(1)) for operation in backend.operations
+            if operation.action in ('mergeRange', 'setString')]
+    assert rows == sorted(rows)
+    assert [operation.target for operation in backend.operations if operation.action == 'mergeRange'][:4] == [
+        'Table1.A1:G1', 'Table1.C1:I1', 'Table1.E1:K1', 'Table1.A10:G10']
+
+
+def test_month_range_stays_in_the_year():
+    backend = _render(2025, months=(12, 12))
+    names = backend.document.TextTables.getElementNames()
+    assert [name for name in names if name.startswith('DayTable')] == [f'DayTable{day}' for day in range(335, 366)]
+
+
+def test_export_is_recorded(tmp_path):
+    backend = _render(2025, months=(1, 1))
+    backend.export_document(str(tmp_path / 'agenda.pdf'), 'writer_pdf_Export')
+    assert backend.document.stored == [((tmp_path / 'agenda.pdf').as_uri(), 'writer_pdf_Export')]
+    assert not (tmp_path / 'agenda.pdf').exists()